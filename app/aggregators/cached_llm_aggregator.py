@@ -0,0 +1,70 @@
+"""
+LLM aggregator serving repeated and near-duplicate prompts from the semantic response cache.
+"""
+from typing import Any, Dict, Optional
+
+from app.aggregators.llm_aggregator import LLMAggregator
+from app.core.llm_cache import SemanticCache, semantic_cache
+from app.report_sections.section_spec import DATA_DELIMITER
+
+
+class CachedLLMAggregator:
+    """
+    Wraps an LLMAggregator and returns cached responses for prompts similar to earlier ones, e.g. when
+    the report of the same company is generated again. It can be passed to the report sections in place
+    of the aggregator; without a configured cache (no redis_url setting) every call goes to the LLM.
+    """
+
+    def __init__(self, aggregator: LLMAggregator, cache: Optional[SemanticCache] = semantic_cache):
+        """
+        Initialize the cached LLM aggregator.
+
+        Args:
+            aggregator: LLM aggregator to call on a cache miss
+            cache: Semantic cache of the responses (defaults to the one shared with the LLM wrapper)
+        """
+        self.aggregator = aggregator
+        self.cache = cache
+
+    async def generate_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.2,
+        response_format: Dict[str, Any] = None
+    ) -> str:
+        """
+        Generate content using the LLM, or take it from the cache.
+
+        Args:
+            prompt: User prompt to send to the API
+            system_prompt: Optional system prompt to provide context
+            temperature: Creativity level (higher = more creative, lower = more consistent)
+            response_format: Optional response format, e.g. {"type": "json_object"} for a JSON response
+
+        Returns:
+            Generated text response
+        """
+        if self.cache is None:
+            return await self.aggregator.generate_content(prompt, system_prompt, temperature, response_format)
+
+        # Only the instruction of a section prompt is compared semantically, the company data after it must match exactly
+        model = self.aggregator.model
+        instruction, _, data = prompt.partition(DATA_DELIMITER)
+        cached, embedding = await self.cache.lookup(instruction, system_prompt, model, data)
+        if cached is not None:
+            return cached
+
+        content = await self.aggregator.generate_content(prompt, system_prompt, temperature, response_format)
+        await self.cache.store(instruction, system_prompt, model, content, embedding, data)
+        return content
+
+    async def close(self) -> None:
+        """Close the wrapped aggregator."""
+        await self.aggregator.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,79 @@
+"""
+Exact-match cache of LLM responses, keyed by a hash of the request.
+"""
+import functools
+from typing import Any, Awaitable, Callable, Dict
+
+import orjson
+import xxhash
+
+from app.core.source_cache import get_cached_async, set_cached_async
+
+# Time to live of cached responses in seconds; long enough for reruns and retries of the same report
+EXACT_CACHE_TTL = 24 * 3600
+
+KEY_PREFIX = "llm_exact:"
+
+
+def exact_key(model: str, system_prompt: str, prompt: str, **options: Any) -> bytes:
+    """
+    Hash an LLM request.
+
+    Args:
+        model: Model name
+        system_prompt: System prompt
+        prompt: User prompt
+        **options: Other request parameters that change the response, e.g. the temperature
+
+    Returns:
+        64-bit xxh3 digest of the request
+    """
+    hasher = xxhash.xxh3_64()
+    for part in (model, system_prompt or "", prompt):
+        hasher.update(part.encode())
+        hasher.update(b"\x00")
+    hasher.update(orjson.dumps(options, option=orjson.OPT_SORT_KEYS))
+    return hasher.digest()
+
+
+async def get_or_compute(key: bytes, compute: Callable[[], Awaitable[str]], ttl: int = EXACT_CACHE_TTL) -> str:
+    """
+    Get a cached response, or compute and cache it.
+
+    Args:
+        key: Request hash from exact_key
+        compute: Coroutine function producing the response on a miss
+        ttl: Time to live of a stored response in seconds
+
+    Returns:
+        The response
+    """
+    cache_key = KEY_PREFIX + key.hex()
+    response = await get_cached_async(cache_key)
+    if response is None:
+        response = await compute()
+        if response:
+            await set_cached_async(cache_key, response, ttl)
+    return response
+
+
+def exact_cached(generate_content):
+    """
+    Serve identical generate_content(prompt, system_prompt, temperature, response_format) calls
+    of an aggregator from the exact-match cache.
+    """
+    @functools.wraps(generate_content)
+    async def wrapper(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.2,
+        response_format: Dict[str, Any] = None
+    ) -> str:
+        key = exact_key(
+            self.model, system_prompt, prompt, temperature=temperature, response_format=response_format
+        )
+        return await get_or_compute(
+            key, lambda: generate_content(self, prompt, system_prompt, temperature, response_format)
+        )
+    return wrapper
@@ -2,8 +2,11 @@
 LLM aggregator for generating structured content using LLMs.
 """
 import os
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 import httpx
+from openai import AsyncOpenAI
+
+from app.aggregators.exact_cache import exact_cached
 
 class LLMAggregator:
     """Class for generating text content using LLMs."""
@@ -20,14 +23,25 @@ class LLMAggregator:
         if not self.api_key:
             raise ValueError("OpenAI API key is required for the LLM aggregator")
 
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
         self.model = model
+        # One pooled client for all sections; over HTTP/2 their concurrent requests share a single TLS connection
+        self._client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+            )
+        )
 
-    async def generate_content(self, prompt: str, system_prompt: str = None, temperature: float = 0.2) -> str:
+    @exact_cached
+    async def generate_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.2,
+        response_format: Dict[str, Any] = None
+    ) -> str:
         """
         Generate content using the LLM.
 
@@ -35,10 +49,34 @@ class LLMAggregator:
             prompt: User prompt to send to the API
             system_prompt: Optional system prompt to provide context
             temperature: Creativity level (higher = more creative, lower = more consistent)
+            response_format: Optional response format, e.g. {"type": "json_object"} for a JSON response
 
         Returns:
             Generated text response
         """
+        # The response is streamed, so it is read while it is generated instead of in one block at the end
+        chunks = [chunk async for chunk in self.generate_content_stream(prompt, system_prompt, temperature, response_format)]
+        return "".join(chunks)
+
+    async def generate_content_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.2,
+        response_format: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate content using the LLM, yielding it as it is generated.
+
+        Args:
+            prompt: User prompt to send to the API
+            system_prompt: Optional system prompt to provide context
+            temperature: Creativity level (higher = more creative, lower = more consistent)
+            response_format: Optional response format, e.g. {"type": "json_object"} for a JSON response
+
+        Returns:
+            Async iterator of the generated text chunks
+        """
         messages = []
 
         if system_prompt:
@@ -49,16 +87,27 @@ class LLMAggregator:
         payload = {
             "model": self.model,
             "messages": messages,
-            "temperature": temperature
+            "temperature": temperature,
+            "stream": True
         }
+        if response_format:
+            payload["response_format"] = response_format
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            result = response.json()
+        stream = await self._client.chat.completions.create(**payload)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
-            return result["choices"][0]["message"]["content"]
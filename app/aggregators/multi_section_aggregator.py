@@ -0,0 +1,109 @@
+"""
+Generation of several report sections with a single LLM call.
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Iterable, List, Tuple
+
+import msgspec
+
+from app.aggregators.llm_aggregator import LLMAggregator
+from app.report_sections.section_spec import SectionSpec, render_section
+from app.report_sections.sections import SECTIONS
+
+MULTI_SECTION_SYSTEM_PROMPT = """You are an expert business analyst creating several sections of a company report at once.
+The instructions and the data of each section are given under a header with the section name.
+Data used by several sections is given once under a MODULE header and referenced as (see MODULE <name>).
+Respond with a JSON object with one key per section, named as the lowercase section header,
+and the Markdown content of the section as its value."""
+
+# Serialized subtrees shorter than this (e.g. empty ones) are cheaper to repeat than to reference
+MIN_MODULE_CHARS = 64
+
+
+def _label(name: str) -> str:
+    return f"## {name.upper()}"
+
+
+def _extract_modules(fragments: Dict[tuple, str], prompts: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Move the data subtrees embedded in several section prompts into shared modules.
+
+    Args:
+        fragments: Serialized subtrees of the report keyed by their path
+        prompts: Section prompts
+
+    Returns:
+        Tuple of the module blocks and the prompts referencing them
+    """
+    modules = []
+    for path, fragment in fragments.items():
+        if len(fragment) < MIN_MODULE_CHARS or sum(fragment in prompt for prompt in prompts) < 2:
+            continue
+        name = ".".join(path)
+        modules.append(f"## MODULE: {name}\n{fragment}")
+        prompts = [prompt.replace(fragment, f"(see MODULE {name})") for prompt in prompts]
+    return modules, prompts
+
+
+class MultiSectionAggregator:
+    """
+    Generates the sections of a report in one request instead of one request per section, paying for
+    a single round trip and sending the shared instructions and the data used by several sections once.
+    Sections missing from the response, or all of them if the response cannot be parsed, are generated separately.
+    """
+
+    def __init__(self, llm_aggregator: LLMAggregator, sections: Iterable[SectionSpec] = SECTIONS):
+        """
+        Initialize the multi-section aggregator.
+
+        Args:
+            llm_aggregator: LLM aggregator for text generation
+            sections: Specs of the report sections (defaults to all sections)
+        """
+        self.llm_aggregator = llm_aggregator
+        self.sections = {spec.name: spec for spec in sections}
+        # The response is decoded straight into a struct with a string field per section,
+        # skipping the intermediate dict and any keys that are not sections
+        output_type = msgspec.defstruct(
+            "MultiSectionLLMOutput", [(name, str, "") for name in self.sections]
+        )
+        self._decoder = msgspec.json.Decoder(output_type)
+
+    async def generate_all(self, raw_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Generate all sections.
+
+        Args:
+            raw_data: Combined raw data from all sources
+
+        Returns:
+            Markdown content of the sections keyed by report field
+        """
+        system_prompts = []
+        prompts = []
+        fragments = {}
+        for name, spec in self.sections.items():
+            system_prompt, prompt = await spec.build_prompts_async(raw_data, fragments)
+            system_prompts.append(f"{_label(name)}\n{system_prompt}")
+            prompts.append(f"{_label(name)}\n{prompt}")
+
+        modules, prompts = _extract_modules(fragments, prompts)
+
+        results = {}
+        try:
+            response = await self.llm_aggregator.generate_content(
+                "\n\n".join(modules + prompts),
+                MULTI_SECTION_SYSTEM_PROMPT + "\n\n" + "\n\n".join(system_prompts),
+                response_format={"type": "json_object"}
+            )
+            results = msgspec.structs.asdict(self._decoder.decode(response))
+        except Exception as e:
+            logging.warning(f"Multi-section generation failed, generating sections separately: {e}")
+
+        sections = {name: content for name, content in results.items() if content}
+        missing = [name for name in self.sections if name not in sections]
+        if missing:
+            contents = await asyncio.gather(*[render_section(self.sections[name], raw_data, self.llm_aggregator, fragments) for name in missing])
+            sections.update(zip(missing, contents))
+        return sections
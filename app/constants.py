@@ -2,11 +2,35 @@ import os
 from pydantic_settings import BaseSettings
 
 OPENAI_MODEL = "gpt-4.1-2025-04-14"
+# Requests per minute allowed per model before LLM calls start to queue
+OPENAI_MAX_RPM = 500
+# Maximum number of LLM requests in flight per report
+OPENAI_MAX_CONCURRENCY = 10
+# Maximum time in seconds a report section may take; a section running longer is left empty
+SECTION_TIMEOUT = 300
+
+# System prompt shared by all report sections built on the raw company data.
+# Keeping it identical across sections lets OpenAI cache the system + data prefix.
+REPORT_SYSTEM_PROMPT = """You are an expert business analyst creating sections of a company report.
+The structured company information is provided as JSON in the first user message.
+Format your responses in Markdown."""
+
+# Content of a section whose input data is empty, returned without calling the LLM
+INSUFFICIENT_DATA_SECTION = "_Section not available due to insufficient data._"
 
 
 class Settings(BaseSettings):
     env: str = "dev"
     openai_api_key: str
+    redis_url: str | None = None
+    source_cache_dir: str = "cache/sources"
+    # HTTP client of the LLM processor: "aiohttp" (scales better with many concurrent calls) or "httpx"
+    llm_http_backend: str = "aiohttp"
+    # Model drafting the report sections, and the model of the final pass polishing them (empty to skip it)
+    section_model: str = "gpt-4o-mini"
+    polish_model: str = "gpt-4o"
+    # Write the market section with one web search tool call instead of one search per market parameter
+    market_web_search_tool: bool = True
 
 
 settings = Settings()
\ No newline at end of file
@@ -1,6 +1,51 @@
-import time
-from app.core.openai_api import get_openai_response, MODEL_COSTS
-from app.constants import OPENAI_MODEL
+import asyncio
+import io
+from typing import Dict, Any, TypeVar
+
+from pydantic import BaseModel
+
+from aiolimiter import AsyncLimiter
+
+from app.core.llm_cache import semantic_cache
+from app.core.openai_api import (
+    build_chat_request,
+    get_openai_parsed_response,
+    get_openai_response,
+    get_openai_web_search_response,
+    MODEL_COSTS,
+    WEB_SEARCH_CALL_COST,
+)
+from app.core.openai_batch import run_batch
+from app.constants import OPENAI_MODEL, OPENAI_MAX_CONCURRENCY, OPENAI_MAX_RPM
+
+ParsedModel = TypeVar("ParsedModel", bound=BaseModel)
+
+# Batch API requests are billed at half the regular price
+BATCH_COST_FACTOR = 0.5
+
+# Per-token prices (prompt, completion) in dollars, precomputed from the per-million prices
+_UNIT_COST = {
+    model: (prices["prompt"] / 1_000_000, prices["completion"] / 1_000_000)
+    for model, prices in MODEL_COSTS.items()
+}
+
+# Maximum silence between two streamed chunks before a completion is considered stalled
+STREAM_CHUNK_TIMEOUT = 30
+
+# Per-model request limiters, shared by all wrapper instances in the process
+_limiters: dict[str, AsyncLimiter] = {}
+
+
+def _get_limiter(model: str) -> AsyncLimiter:
+    if model not in _limiters:
+        _limiters[model] = AsyncLimiter(OPENAI_MAX_RPM, 60)
+    return _limiters[model]
+
+
+def _cached_tokens(usage) -> int:
+    """Number of prompt tokens OpenAI served from its prompt cache."""
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(usage, "input_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
 
 
 class LLMAPIWrapper:
@@ -10,26 +55,203 @@ class LLMAPIWrapper:
 
     def __init__(self):
         self.accumulated_cost = 0
+        # Bounds concurrent requests of one report; the per-model limiters bound the request rate
+        self._semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        # Prompt tokens sent and served from OpenAI's prompt cache
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of the prompt tokens served from OpenAI's prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def _add_cost(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        factor: float = 1.0,
+        cached_tokens: int = 0
+    ) -> None:
+        # No await between read and write, so concurrent calls on the event loop cannot lose updates
+        prompt_unit, completion_unit = _UNIT_COST[model]
+        self.accumulated_cost += factor * (prompt_unit * prompt_tokens + completion_unit * completion_tokens)
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
 
     async def get_response(
         self,
         prompt: str,
         system_prompt: str = None,
         max_tokens: int = 4096,
-        model=None
+        model=None,
+        context: str = None,
+        stream: bool = False,
+        cache_scope: str = None
     ):
-        time.sleep(1)
         model = model or OPENAI_MODEL
-        response = await get_openai_response(prompt, system_prompt, max_tokens, model)
+        # Semantic cache matches are limited to the exact context, plus cache_scope for callers that put the
+        # company-specific part (e.g. the website URL) into the prompt; cache_scope is not sent to the model
+        cache_context = context if cache_scope is None else f"{cache_scope}\n{context or ''}"
+        embedding = None
+        if semantic_cache:
+            cached, embedding = await semantic_cache.lookup(prompt, system_prompt, model, cache_context)
+            if cached is not None:
+                return cached
+
+        if stream:
+            async with self._semaphore:
+                response = await self._get_streamed_response(prompt, system_prompt, max_tokens, model, context)
+            if semantic_cache:
+                await semantic_cache.store(prompt, system_prompt, model, response, embedding, cache_context)
+            return response
+
+        async with self._semaphore, _get_limiter(model):
+            response = await get_openai_response(prompt, system_prompt, max_tokens, model, context)
 
-        model_prices = MODEL_COSTS[model]
-        prompt_cost = model_prices['prompt'] * response.usage.prompt_tokens
-        completion_cost = model_prices['completion'] * response.usage.completion_tokens
-        total_cost = (prompt_cost + completion_cost) / 1000000
-        self.accumulated_cost += total_cost
+        usage = response.usage
+        self._add_cost(model, usage.prompt_tokens, usage.completion_tokens, cached_tokens=_cached_tokens(usage))
         response_message = response.choices[0].message
         if response_message.annotations:
             response = {"annotations": response_message.annotations, "content": response_message.content}
         else:
             response = response_message.content
-        return response
\ No newline at end of file
+            if semantic_cache:
+                await semantic_cache.store(prompt, system_prompt, model, response, embedding, cache_context)
+        return response
+
+    async def _get_streamed_response(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_tokens: int,
+        model: str,
+        context: str
+    ) -> str:
+        """
+        Stream a completion and collect its content.
+        A completion that stalls for longer than STREAM_CHUNK_TIMEOUT is aborted instead of
+        holding the job until the overall request timeout.
+        """
+        async with _get_limiter(model):
+            stream = await get_openai_response(prompt, system_prompt, max_tokens, model, context, stream=True)
+
+        buffer = io.StringIO()
+        chunks = aiter(stream)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), STREAM_CHUNK_TIMEOUT)
+                except StopAsyncIteration:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    buffer.write(chunk.choices[0].delta.content)
+                if chunk.usage:
+                    self._add_cost(
+                        model, chunk.usage.prompt_tokens, chunk.usage.completion_tokens,
+                        cached_tokens=_cached_tokens(chunk.usage)
+                    )
+        finally:
+            await stream.close()
+        return buffer.getvalue()
+
+    async def get_parsed_response(
+        self,
+        prompt: str,
+        response_format: type[ParsedModel],
+        system_prompt: str = None,
+        max_tokens: int = 4096,
+        model=None,
+        context: str = None
+    ) -> ParsedModel:
+        """
+        Get a structured output response parsed into a pydantic model.
+
+        Args:
+            prompt: User prompt
+            response_format: Pydantic model describing the expected output
+            system_prompt: System prompt
+            max_tokens: Maximum number of completion tokens
+            model: Model name (defaults to OPENAI_MODEL)
+            context: Shared context sent ahead of the prompt
+
+        Returns:
+            Parsed response, or None if the model refused to answer
+        """
+        model = model or OPENAI_MODEL
+        async with self._semaphore, _get_limiter(model):
+            response = await get_openai_parsed_response(
+                prompt, response_format, system_prompt, max_tokens, model, context
+            )
+
+        usage = response.usage
+        self._add_cost(model, usage.prompt_tokens, usage.completion_tokens, cached_tokens=_cached_tokens(usage))
+        return response.choices[0].message.parsed
+
+    async def get_web_search_response(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        max_tokens: int = 4096,
+        model=None
+    ) -> str:
+        """
+        Get a response from a model with the built-in web search tool, which runs all the searches
+        the prompt asks for within a single request.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            max_tokens: Maximum number of output tokens
+            model: Model name (defaults to OPENAI_MODEL)
+
+        Returns:
+            Response content
+        """
+        model = model or OPENAI_MODEL
+        async with self._semaphore, _get_limiter(model):
+            response = await get_openai_web_search_response(prompt, system_prompt, max_tokens, model)
+
+        usage = response.usage
+        self._add_cost(model, usage.input_tokens, usage.output_tokens, cached_tokens=_cached_tokens(usage))
+        search_calls = sum(1 for item in response.output if item.type == "web_search_call")
+        self.accumulated_cost += WEB_SEARCH_CALL_COST * search_calls
+        return response.output_text
+
+    async def get_batch_responses(self, requests: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Run several requests through the OpenAI Batch API and wait for the results.
+        Intended for non-interactive jobs, as a batch may take minutes to hours to complete.
+
+        Args:
+            requests: Keyword arguments of get_response keyed by a custom ID
+
+        Returns:
+            Response contents keyed by the custom ID; failed requests are omitted
+        """
+        bodies = {custom_id: build_chat_request(**kwargs) for custom_id, kwargs in requests.items()}
+        results = await run_batch(bodies)
+
+        return {
+            custom_id: self.record_batch_response(bodies[custom_id]["model"], body)
+            for custom_id, body in results.items()
+        }
+
+    def record_batch_response(self, model: str, body: Dict[str, Any]) -> str:
+        """
+        Account for the cost of a Batch API response and return its content.
+
+        Args:
+            model: Model of the request
+            body: Chat completion response body from the batch output
+
+        Returns:
+            Response content
+        """
+        usage = body["usage"]
+        self._add_cost(
+            model, usage["prompt_tokens"], usage["completion_tokens"], BATCH_COST_FACTOR,
+            (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        )
+        return body["choices"][0]["message"]["content"]
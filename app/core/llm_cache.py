@@ -0,0 +1,186 @@
+"""
+Semantic response cache for LLM completions, backed by Redis vector search.
+"""
+import hashlib
+import logging
+import struct
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.commands.search.field import TagField, TextField, VectorField
+from redis.commands.search.query import Query
+
+try:
+    from redis.commands.search.index_definition import IndexDefinition, IndexType
+except ImportError:
+    # redis-py < 6
+    from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+
+from app.constants import settings
+from app.core.openai_api import openai_client
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+# text-embedding-3-small accepts ~8k tokens, keep the key text well below that
+EMBEDDING_MAX_CHARS = 24000
+
+# Entries are scoped by a hash of the model, system prompt and context (see SemanticCache); the index
+# and keys are versioned so that entries from before the scope field are not matched
+INDEX_NAME = "llm_cache_idx_v2"
+KEY_PREFIX = "llm_cache:v2:"
+
+
+def _escape_tag(value: str) -> str:
+    """Escape punctuation in a value used inside a RediSearch TAG query."""
+    return "".join(f"\\{c}" if not c.isalnum() else c for c in value)
+
+
+class SemanticCache:
+    """
+    Cache of LLM responses keyed by prompt.
+    An exact hash match is tried first; on a miss the prompt (the instruction) is embedded and the
+    nearest stored prompt is returned if it is similar enough. Semantic matches are limited to entries
+    with exactly the same model, system prompt and context, so that sections sharing the company data
+    or companies with similar data never get each other's responses.
+    """
+
+    def __init__(self, redis_url: str, threshold: float = 0.92, ttl: int = 86400):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            redis_url: Redis connection URL (requires the RediSearch module)
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl: Time to live of cached entries in seconds
+        """
+        self.redis = Redis.from_url(redis_url)
+        self.threshold = threshold
+        self.ttl = ttl
+        self._index_ready = False
+
+    @staticmethod
+    def _scope(system_prompt: Optional[str], context: Optional[str], model: str) -> str:
+        """Hash of everything sent with the prompt; only entries of the same scope can match semantically."""
+        hasher = hashlib.sha256()
+        for part in (model, system_prompt or "", context or ""):
+            hasher.update(part.encode("utf-8"))
+            hasher.update(b"\x00")
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _key(prompt: str, scope: str) -> str:
+        return KEY_PREFIX + hashlib.sha256(f"{scope}\n{prompt}".encode("utf-8")).hexdigest()
+
+    async def _ensure_index(self) -> None:
+        if self._index_ready:
+            return
+        try:
+            await self.redis.ft(INDEX_NAME).info()
+        except Exception:
+            await self.redis.ft(INDEX_NAME).create_index(
+                [
+                    TextField("content"),
+                    TagField("model"),
+                    TagField("scope"),
+                    VectorField(
+                        "embedding",
+                        "HNSW",
+                        {"TYPE": "FLOAT32", "DIM": EMBEDDING_DIM, "DISTANCE_METRIC": "COSINE"},
+                    ),
+                ],
+                definition=IndexDefinition(prefix=[KEY_PREFIX], index_type=IndexType.HASH),
+            )
+        self._index_ready = True
+
+    async def _embed(self, text: str) -> list[float]:
+        response = await openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=text[:EMBEDDING_MAX_CHARS],
+        )
+        return response.data[0].embedding
+
+    async def lookup(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        context: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[list[float]]]:
+        """
+        Look up a cached response for the prompt.
+
+        Args:
+            prompt: User prompt with the instruction, the only part compared semantically
+            system_prompt: System prompt
+            model: Model name
+            context: Data sent with the prompt, e.g. the company data, matched exactly
+
+        Returns:
+            Tuple of the cached content (None on a miss) and the prompt embedding,
+            which should be passed to store() to avoid embedding the prompt twice
+        """
+        scope = self._scope(system_prompt, context, model)
+        key = self._key(prompt, scope)
+        embedding = None
+        try:
+            # Exact match fast path, no embedding needed
+            content = await self.redis.hget(key, "content")
+            if content is not None:
+                return content.decode("utf-8"), None
+
+            await self._ensure_index()
+            embedding = await self._embed(prompt)
+            query = (
+                Query(f"(@scope:{{{_escape_tag(scope)}}})=>[KNN 1 @embedding $vec AS distance]")
+                .sort_by("distance")
+                .return_fields("content", "distance")
+                .dialect(2)
+            )
+            vector = struct.pack(f"{len(embedding)}f", *embedding)
+            result = await self.redis.ft(INDEX_NAME).search(query, query_params={"vec": vector})
+            if result.docs:
+                doc = result.docs[0]
+                if 1 - float(doc.distance) > self.threshold:
+                    return doc.content, embedding
+        except Exception as e:
+            logging.warning(f"LLM cache lookup failed: {e}")
+        return None, embedding
+
+    async def store(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        content: str,
+        embedding: Optional[list[float]] = None,
+        context: Optional[str] = None
+    ) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            prompt: User prompt with the instruction
+            system_prompt: System prompt
+            model: Model name
+            content: Response content to cache
+            embedding: Prompt embedding returned by lookup(), computed if missing
+            context: Data sent with the prompt, as passed to lookup()
+        """
+        scope = self._scope(system_prompt, context, model)
+        key = self._key(prompt, scope)
+        try:
+            await self._ensure_index()
+            if embedding is None:
+                embedding = await self._embed(prompt)
+            await self.redis.hset(key, mapping={
+                "embedding": struct.pack(f"{len(embedding)}f", *embedding),
+                "content": content,
+                "model": model,
+                "scope": scope,
+            })
+            await self.redis.expire(key, self.ttl)
+        except Exception as e:
+            logging.warning(f"LLM cache store failed: {e}")
+
+
+semantic_cache = SemanticCache(settings.redis_url) if settings.redis_url else None
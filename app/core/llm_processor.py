@@ -1,31 +1,249 @@
 """
 LLM processing with GPT-4o for generating structured report sections.
 """
+import asyncio
+import io
+import logging
 import os
 from typing import Dict, Any
-import json
+import aiohttp
+import orjson
 import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+from app.constants import OPENAI_MAX_CONCURRENCY, settings
+from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.data_sources.http_client import RETRYABLE_CLIENT_STATUSES
+from app.utils.data_utils import canonical_json
+
+# Markers of the server-sent events of a streamed completion
+SSE_DATA_PREFIX = "data:"
+SSE_DONE = "[DONE]"
+
+# Upper bound of a single wait between attempts, whether from Retry-After or the backoff
+MAX_RETRY_WAIT = 60
+
+
+# Shared by all sections. The collected data is appended to it once per report, so every call of a report
+# starts with a byte-identical system turn, which OpenAI caches automatically once it is longer than 1024 tokens
+SYSTEM_PROMPT = """You are an expert business analyst creating sections of a company report.
+The collected company data is provided as JSON after CONTEXT below, each request contains the task for one section.
+Format your responses in Markdown."""
+
+CONTEXT_HEADER = "\nCONTEXT:\n"
+
+# Section tasks, sent as the user turn after the shared system turn
+TASK_TEMPLATES = {
+    "company_overview": """Create a company overview section for {company_name} ({url}), acting as a financial analyst.
+    Write a concise but informative company overview in 4-6 lines.
+    Include the company's business model, geography, stage, and uniqueness.
+    Rely mostly on the home and about pages of the website data, the LinkedIn company profile
+    and the "company overview" search results.""",
+    "product_business_model": """Create a detailed product and business model section for {company_name} ({url}), acting as a business analyst.
+    Provide detailed information about the company's products, services, revenue streams and key characteristics.
+    Present the information in a tabular or text form depending on the company type (consumer goods, SaaS, e-commerce, etc.).
+    Rely mostly on the home, products, services and solutions pages of the website data, the LinkedIn company profile,
+    the "products services" search results and the business model research.""",
+    "market_analysis": """Create a market analysis section for {company_name} ({url}), acting as a market analyst.
+    Identify the Total Addressable Market (TAM), market segments, CAGR (Compound Annual Growth Rate), and geographic expansion.
+    If exact figures are not available, provide reasonable estimates based on the industry and similar companies.
+    Rely mostly on the market analysis research, the "market size" search results and the funding company details.""",
+    "competitive_landscape": """Create a competitive landscape section for {company_name} ({url}), acting as a competitive intelligence analyst.
+    Identify direct competitors and their metrics (valuation, revenue, customers, geographic presence).
+    Include indirect competitors if relevant.
+    Create a table of competitors and provide a brief description of market saturation.
+    Rely mostly on the competitive landscape research, the "competitors" search results and the funding company details.""",
+    "financial_metrics": """Create a financial metrics section for {company_name} ({url}), acting as a financial analyst.
+    Extract key metrics such as Revenue, EBITDA, GMV, MRR/ARR, and number of customers.
+    If specific figures are not available, provide estimates based on available data or industry benchmarks.
+    Include a table of metrics if possible.
+    Rely mostly on the financial metrics research, the "revenue financial metrics" search results and the funding company details.""",
+    "fundraising_history": """Create a fundraising history section for {company_name} ({url}), acting as a venture capital analyst.
+    List funding rounds with dates, investment amounts, and company valuations.
+    Format as a chronological table with the most recent rounds first.
+    Rely mostly on the funding rounds and investors of the funding data, the "funding investment rounds" search results
+    and the fundraising research.""",
+    "team_stakeholders": """Create a team and key stakeholders section for {company_name} ({url}), acting as an organizational analyst.
+    List key employees and investors with their roles and experience.
+    Evaluate the relevance of their experience and achievements.
+    Use separate subsections for management team and investors.
+    Rely mostly on the LinkedIn employees, the team page of the website data, the investors of the funding data,
+    the "team executives management" search results and the team research.""",
+}
+
+
+def _error_response(exc: BaseException) -> tuple[int | None, Any]:
+    """Get the status and headers of the response behind an HTTP error of either backend."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code, exc.response.headers
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status, exc.headers or {}
+    return None, {}
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Check whether a failed request is worth retrying: timeouts, connection errors, 5xx, 408 and 429."""
+    status, _ = _error_response(exc)
+    if status is not None:
+        return status >= 500 or status in RETRYABLE_CLIENT_STATUSES
+    return isinstance(exc, (httpx.TransportError, aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+_backoff = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Wait for the Retry-After period of a rate limited response, or back off exponentially with jitter."""
+    _, headers = _error_response(retry_state.outcome.exception())
+    try:
+        return min(float(headers.get("Retry-After")), MAX_RETRY_WAIT)
+    except (TypeError, ValueError):
+        return _backoff(retry_state)
+
 
 class LLMProcessor:
     """Class for processing data using LLMs (GPT-4o)."""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, llm: LLMAPIWrapper = None, model: str = None):
         """
         Initialize the LLM processor.
 
         Args:
-            api_key: OpenAI API key (defaults to environment variable)
+            api_key: OpenAI API key (defaults to environment variable), used without an LLM wrapper
+            llm: LLMAPIWrapper to send the requests through, sharing its connection pool,
+                rate limits and retries with the other processors of the report
+            model: Model drafting the sections (defaults to the section_model setting)
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required for the LLM processor")
-
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        self.model = "gpt-4o"
+        self.llm = llm
+        self.model = model or settings.section_model
+        self._session: aiohttp.ClientSession | None = None
+        self._client = None
+        self._use_aiohttp = False
+        if llm is None:
+            self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+            if not self.api_key:
+                raise ValueError("OpenAI API key is required for the LLM processor")
+
+            self.api_url = "https://api.openai.com/v1/chat/completions"
+            self.headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            # One pooled client for all section calls, so only the first one pays for the TLS handshake.
+            # The aiohttp session is created on first use, as it must be bound to the running event loop.
+            self._use_aiohttp = settings.llm_http_backend == "aiohttp"
+            if not self._use_aiohttp:
+                self._client = httpx.AsyncClient(
+                    http2=True,
+                    headers=self.headers,
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+                )
+        self._semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        # System turn with the canonical JSON of the report data, built once and shared by all sections
+        self._context_data = None
+        self._shared_system = None
+        # Prompt tokens sent and served from OpenAI's prompt cache
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client (the LLM wrapper, if any, is owned by the caller)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._client is not None:
+            await self._client.aclose()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=200, limit_per_host=100, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=120, connect=5)
+            )
+        return self._session
+
+    @retry(
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(6),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True
+    )
+    async def _stream(self, payload: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
+        """
+        Post a streamed chat completion request with the configured HTTP backend and assemble the content.
+        Transient failures (rate limits, 5xx, connection errors) are retried up to 6 attempts.
+
+        Args:
+            payload: Request body, with "stream" enabled
+
+        Returns:
+            Tuple of the completion content and the usage reported with the last chunk
+        """
+        buffer = io.StringIO()
+        usage = {}
+
+        def consume(line: str) -> None:
+            nonlocal usage
+            # Server-sent events: one "data: {json}" line per chunk, terminated by "data: [DONE]"
+            if not line.startswith(SSE_DATA_PREFIX):
+                return
+            data = line[len(SSE_DATA_PREFIX):].strip()
+            if data == SSE_DONE:
+                return
+            chunk = orjson.loads(data)
+            if chunk.get("choices") and chunk["choices"][0]["delta"].get("content"):
+                buffer.write(chunk["choices"][0]["delta"]["content"])
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+
+        if self._use_aiohttp:
+            async with self._get_session().post(self.api_url, data=orjson.dumps(payload)) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    consume(line.decode("utf-8"))
+        else:
+            async with self._client.stream("POST", self.api_url, content=orjson.dumps(payload)) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    consume(line)
+
+        return buffer.getvalue(), usage
+
+    def _shared_system_prompt(self, data: Dict[str, Any]) -> str:
+        """
+        Build the system turn shared by all sections of a report, once per report.
+
+        Args:
+            data: Raw data collected from various sources
+
+        Returns:
+            System prompt followed by the JSON of the data, byte-identical for all sections of the report
+        """
+        if data is not self._context_data:
+            self._context_data = data
+            self._shared_system = SYSTEM_PROMPT + CONTEXT_HEADER + canonical_json(data)
+        return self._shared_system
+
+    async def _generate_section(self, name: str, data: Dict[str, Any]) -> str:
+        """
+        Generate a section from the shared system turn and the task of the section.
+
+        Args:
+            name: Section name in TASK_TEMPLATES
+            data: Raw data collected from various sources
+
+        Returns:
+            Markdown formatted section
+        """
+        task = TASK_TEMPLATES[name].format(company_name=data["company_name"], url=data["url"])
+        return await self._call_llm(prompt=task, system_prompt=self._shared_system_prompt(data))
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of the prompt tokens served from OpenAI's prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
 
     async def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
         """
@@ -38,6 +256,10 @@ class LLMProcessor:
         Returns:
             Generated text response
         """
+        if self.llm is not None:
+            # The wrapper applies the shared concurrency limit, rate limiter and retries, and accounts for the cost
+            return await self.llm.get_response(prompt, system_prompt, model=self.model, stream=True)
+
         messages = []
 
         if system_prompt:
@@ -48,19 +270,23 @@ class LLMProcessor:
         payload = {
             "model": self.model,
             "messages": messages,
-            "temperature": 0.2
+            "temperature": 0.2,
+            "stream": True,
+            "stream_options": {"include_usage": True}
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            result = response.json()
+        async with self._semaphore:
+            content, usage = await self._stream(payload)
+
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.cached_tokens += cached_tokens
+        logging.info(
+            f"LLM call used {usage.get('prompt_tokens', 0)} prompt tokens, {cached_tokens} cached "
+            f"(hit rate so far {self.cache_hit_rate:.0%})"
+        )
 
-            return result["choices"][0]["message"]["content"]
+        return content
 
     async def generate_company_overview(self, data: Dict[str, Any]) -> str:
         """
@@ -72,25 +298,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted company overview
         """
-        system_prompt = """You are a financial analyst creating a company overview section for a report.
-        Write a concise but informative company overview in 4-6 lines.
-        Include the company's business model, geography, stage, and uniqueness.
-        Format your response in Markdown."""
-
-        prompt = f"""Based on the following data, create a company overview section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Website Data: {json.dumps(data.get("website_data", {}).get("home", {}), indent=2)}
-        
-        About Page: {json.dumps(data.get("website_data", {}).get("about", {}), indent=2)}
-        
-        LinkedIn Data: {json.dumps(data.get("linkedin_data", {}).get("company_profile", {}), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("company overview", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("company_overview", data)
 
     async def generate_product_business_model(self, data: Dict[str, Any]) -> str:
         """
@@ -102,29 +310,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted product and business model description
         """
-        system_prompt = """You are a business analyst creating a product and business model section for a company report.
-        Provide detailed information about the company's products, services, revenue streams and key characteristics.
-        Present the information in a tabular or text form depending on the company type (consumer goods, SaaS, e-commerce, etc.).
-        Format your response in Markdown."""
-
-        prompt = f"""Based on the following data, create a detailed product and business model section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Website Data: 
-        - Home: {json.dumps(data.get("website_data", {}).get("home", {}), indent=2)}
-        - Products: {json.dumps(data.get("website_data", {}).get("products", {}), indent=2)}
-        - Services: {json.dumps(data.get("website_data", {}).get("services", {}), indent=2)}
-        - Solutions: {json.dumps(data.get("website_data", {}).get("solutions", {}), indent=2)}
-        
-        LinkedIn Data: {json.dumps(data.get("linkedin_data", {}).get("company_profile", {}), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("products services", {}), indent=2)}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("business_model", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("product_business_model", data)
 
     async def generate_market_analysis(self, data: Dict[str, Any]) -> str:
         """
@@ -136,23 +322,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted market analysis
         """
-        system_prompt = """You are a market analyst creating a market analysis section for a company report.
-        Identify the Total Addressable Market (TAM), market segments, CAGR (Compound Annual Growth Rate), and geographic expansion.
-        If exact figures are not available, provide reasonable estimates based on the industry and similar companies.
-        Format your response in Markdown."""
-
-        prompt = f"""Based on the following data, create a market analysis section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("market_analysis", {}), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("market size", {}), indent=2)}
-        
-        Company Details: {json.dumps(data.get("funding_data", {}).get("company_details", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("market_analysis", data)
 
     async def generate_competitive_landscape(self, data: Dict[str, Any]) -> str:
         """
@@ -164,24 +334,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted competitive landscape analysis
         """
-        system_prompt = """You are a competitive intelligence analyst creating a competitive landscape section for a company report.
-        Identify direct competitors and their metrics (valuation, revenue, customers, geographic presence).
-        Include indirect competitors if relevant.
-        Create a table of competitors and provide a brief description of market saturation.
-        Format your response in Markdown."""
-
-        prompt = f"""Based on the following data, create a competitive landscape section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("competitive_landscape", {}), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("competitors", {}), indent=2)}
-        
-        Company Details: {json.dumps(data.get("funding_data", {}).get("company_details", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("competitive_landscape", data)
 
     async def generate_financial_metrics(self, data: Dict[str, Any]) -> str:
         """
@@ -193,23 +346,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted financial metrics analysis
         """
-        system_prompt = """You are a financial analyst creating a financial metrics section for a company report.
-        Extract key metrics such as Revenue, EBITDA, GMV, MRR/ARR, and number of customers.
-        If specific figures are not available, provide estimates based on available data or industry benchmarks.
-        Format your response in Markdown with a table of metrics if possible."""
-
-        prompt = f"""Based on the following data, create a financial metrics section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("financial_metrics", {}), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("revenue financial metrics", {}), indent=2)}
-        
-        Company Details: {json.dumps(data.get("funding_data", {}).get("company_details", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("financial_metrics", data)
 
     async def generate_fundraising_history(self, data: Dict[str, Any]) -> str:
         """
@@ -221,25 +358,7 @@ class LLMProcessor:
         Returns:
             Markdown formatted fundraising history
         """
-        system_prompt = """You are a venture capital analyst creating a fundraising history section for a company report.
-        List funding rounds with dates, investment amounts, and company valuations.
-        Format as a chronological table with the most recent rounds first.
-        Format your response in Markdown."""
-
-        prompt = f"""Based on the following data, create a fundraising history section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        Funding Data: 
-        - Rounds: {json.dumps(data.get("funding_data", {}).get("funding_rounds", []), indent=2)}
-        - Investors: {json.dumps(data.get("funding_data", {}).get("investors", []), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("funding investment rounds", {}), indent=2)}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("fundraising", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("fundraising_history", data)
 
     async def generate_team_stakeholders(self, data: Dict[str, Any]) -> str:
         """
@@ -251,25 +370,4 @@ class LLMProcessor:
         Returns:
             Markdown formatted team and stakeholders analysis
         """
-        system_prompt = """You are an organizational analyst creating a team and key stakeholders section for a company report.
-        List key employees and investors with their roles and experience.
-        Evaluate the relevance of their experience and achievements.
-        Format your response in Markdown, with separate subsections for management team and investors."""
-
-        prompt = f"""Based on the following data, create a team and key stakeholders section for {data["company_name"]}.
-        
-        Company URL: {data["url"]}
-        
-        LinkedIn Data: 
-        - Employees: {json.dumps(data.get("linkedin_data", {}).get("employees", []), indent=2)}
-        
-        Website Data: {json.dumps(data.get("website_data", {}).get("team", {}), indent=2)}
-        
-        Funding Data: {json.dumps(data.get("funding_data", {}).get("investors", []), indent=2)}
-        
-        Search Data: {json.dumps(data.get("search_data", {}).get("team executives management", {}), indent=2)}
-        
-        Research Data: {json.dumps(data.get("research_data", {}).get("team", {}), indent=2)}
-        """
-
-        return await self._call_llm(prompt, system_prompt)
+        return await self._generate_section("team_stakeholders", data)
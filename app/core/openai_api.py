@@ -1,6 +1,10 @@
 import asyncio
 import logging
+import random
+
+import httpx
 from openai import AsyncOpenAI, RateLimitError
+from pydantic import BaseModel
 
 from app.constants import OPENAI_MODEL, settings
 
@@ -42,21 +46,28 @@ MODEL_COSTS = {
     }
 }
 
+# Fee of one call of the Responses API web_search tool in dollars ($10 per 1k calls), billed on top of the tokens
+WEB_SEARCH_CALL_COST = 10.0 / 1000
+
 
 class OpenAIClient:
     _instance = None
 
     def __new__(cls):
-        api_key = settings.openai_api_key
         if cls._instance is None:
+            api_key = settings.openai_api_key
             if not api_key or not isinstance(api_key, str):
                 raise ValueError("API key is invalid. Please provide a valid OpenAI API key.")
-            # if not base_url or not isinstance(base_url, str) or not base_url.startswith("http"):
-            #     raise ValueError(
-            #         "Proxy URL is invalid. Please provide a valid proxy URL starting with 'http' or 'https'.")
 
-            # cls._instance = AsyncOpenAI(api_key=api_key, base_url=base_url)
-            cls._instance = AsyncOpenAI(api_key=api_key)
+            # Raise httpx's default pool limits so concurrent section and embedding calls don't queue
+            cls._instance = AsyncOpenAI(
+                api_key=api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                ),
+            )
 
         return cls._instance
 
@@ -64,70 +75,144 @@ class OpenAIClient:
 openai_client = OpenAIClient()
 
 
-async def get_openai_response(
+def build_chat_request(
     prompt: str,
     system_prompt: str = None,
     max_tokens: int = 4096,
-    model: str = OPENAI_MODEL
-):
+    model: str = OPENAI_MODEL,
+    context: str = None
+) -> dict:
     """
-    Send a request to the OpenAI API and return the response.
-    If a 429 error (rate limit) is encountered, retry with exponential backoff.
+    Build the keyword arguments (request body) of a chat completion request.
+    The optional context is sent as a separate user message between the system prompt and the prompt,
+    so that calls sharing the same system prompt and context share a prefix eligible for OpenAI prompt caching.
     """
+    if model.startswith("o1-") or model.startswith("gpt-4o-search"):
+        # For "o1-" models, send only a user prompt
+        return {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt
+                        }
+                    ]
+                }
+            ]
+        }
+
+    # For other models, include a system prompt and user prompt
     system_prompt = system_prompt or "You are an AI publishing assistant"
+    messages = [{"role": "system", "content": system_prompt}]
+    if context:
+        messages.append({"role": "user", "content": context})
+    messages.append({"role": "user", "content": prompt})
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": 0.5,
+        "seed": 666,
+        "messages": messages,
+    }
 
+
+async def _request_with_retries(create, **kwargs):
+    """
+    Call an OpenAI client method and return the response.
+    If a 429 error (rate limit) is encountered, wait for the Retry-After period
+    (or the exponential backoff if the header is missing) plus random jitter and retry.
+    """
     max_retries = 5
     backoff_seconds = 1
+    max_backoff_seconds = 60
 
     for attempt in range(max_retries):
         try:
-            if model.startswith("o1-") or model.startswith("gpt-4o-search"):
-                # For "o1-" models, send only a user prompt
-                response = await openai_client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": prompt
-                                }
-                            ]
-                        }
-                    ]
-                )
-            else:
-                # For other models, include a system prompt and user prompt
-                response = await openai_client.chat.completions.create(
-                    model=model,
-                    max_tokens=max_tokens,
-                    temperature=0.5,
-                    seed=666,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt},
-                    ],
-                )
+            response = await create(**kwargs)
 
             # If we got here without raising an exception, return the response
             return response
 
-        except Exception as exc:
-            # Handle 429 (rate limit) specifically
-            if isinstance(exc, RateLimitError):
-                if attempt < max_retries - 1:
-                    logging.warning(
-                        f"Rate limit hit. Retrying in {backoff_seconds} seconds..."
-                    )
-                    await asyncio.sleep(backoff_seconds)
-                    backoff_seconds *= 2  # Exponential backoff
-                else:
-                    logging.error("Max retries reached. Raising the exception.")
-                    raise
-            else:
-                # If it's not a 429, re-raise the exception
+        except RateLimitError as exc:
+            if attempt == max_retries - 1:
+                logging.error("Max retries reached. Raising the exception.")
                 raise
 
+            try:
+                retry_after = float(exc.response.headers.get("retry-after", backoff_seconds))
+            except (TypeError, ValueError):
+                retry_after = backoff_seconds
+            # Jitter keeps concurrent requests from retrying in lockstep
+            sleep_seconds = retry_after + random.uniform(0, retry_after * 0.25)
+            logging.warning(f"Rate limit hit. Retrying in {sleep_seconds:.1f} seconds...")
+            await asyncio.sleep(sleep_seconds)
+            backoff_seconds = min(backoff_seconds * 2, max_backoff_seconds)
+
     # If, for some reason, we break out of the loop without returning or raising:
     raise RuntimeError("Unable to get a valid OpenAI response after max retries.")
+
+
+async def get_openai_response(
+    prompt: str,
+    system_prompt: str = None,
+    max_tokens: int = 4096,
+    model: str = OPENAI_MODEL,
+    context: str = None,
+    stream: bool = False
+):
+    """
+    Send a request to the OpenAI API and return the response.
+    If a 429 error (rate limit) is encountered, retry with exponential backoff.
+    With stream=True an async iterator of completion chunks is returned instead; the last chunk carries the usage.
+    """
+    request = build_chat_request(prompt, system_prompt, max_tokens, model, context)
+    if stream:
+        request.update(stream=True, stream_options={"include_usage": True})
+    return await _request_with_retries(openai_client.chat.completions.create, **request)
+
+
+async def get_openai_parsed_response(
+    prompt: str,
+    response_format: type[BaseModel],
+    system_prompt: str = None,
+    max_tokens: int = 4096,
+    model: str = OPENAI_MODEL,
+    context: str = None
+):
+    """
+    Send a structured output request to the OpenAI API.
+    The completion is parsed into response_format and available as response.choices[0].message.parsed.
+    """
+    request = build_chat_request(prompt, system_prompt, max_tokens, model, context)
+    return await _request_with_retries(
+        openai_client.beta.chat.completions.parse,
+        response_format=response_format,
+        **request
+    )
+
+
+async def get_openai_web_search_response(
+    prompt: str,
+    system_prompt: str = None,
+    max_tokens: int = 4096,
+    model: str = OPENAI_MODEL
+):
+    """
+    Send a request to the OpenAI Responses API with the built-in web search tool.
+    The model runs as many searches as it needs within the single request; the answer is available
+    as response.output_text.
+    """
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return await _request_with_retries(
+        openai_client.responses.create,
+        model=model,
+        tools=[{"type": "web_search"}],
+        input=messages,
+        max_output_tokens=max_tokens,
+    )
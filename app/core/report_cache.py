@@ -0,0 +1,88 @@
+"""
+Persistent cache of generated reports and their sections, keyed by a hash of the collected data.
+"""
+import asyncio
+import hashlib
+from typing import Any, Dict, Iterable
+
+import orjson
+
+from app.constants import settings
+from app.core.source_cache import get_cached_async, set_cached_async
+from app.models.report import ReportModel
+
+# Reports and drafted sections are reused for a week, the same as the scraped pages they are written from
+REPORT_TTL = 7 * 24 * 3600
+
+# Part of the cache key; bump it when the section or polish prompts change, so that reports written
+# with the old prompts are not served anymore
+PROMPT_VERSION = 1
+
+
+def report_cache_key(raw_data: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a report from its collected data. The data includes the company URL,
+    so the same company with unchanged data maps to the same key. The section and polish models
+    and PROMPT_VERSION are part of the key, so changing them does not serve the old reports.
+
+    Args:
+        raw_data: Combined raw data from all sources
+
+    Returns:
+        Hex digest of the canonical JSON of the data and the generation settings
+    """
+    keyed = [PROMPT_VERSION, settings.section_model, settings.polish_model, raw_data]
+    return hashlib.blake2b(orjson.dumps(keyed, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+async def get_cached_report(key: str) -> ReportModel | None:
+    """
+    Get a report stored with cache_report.
+
+    Args:
+        key: Report cache key
+
+    Returns:
+        The report, or None on a miss
+    """
+    report = await get_cached_async(f"report:{key}")
+    return ReportModel(**report) if report is not None else None
+
+
+async def cache_report(key: str, report: ReportModel) -> None:
+    """
+    Store a completed report.
+
+    Args:
+        key: Report cache key
+        report: Generated report
+    """
+    await set_cached_async(f"report:{key}", report.model_dump(), REPORT_TTL)
+
+
+async def get_cached_sections(key: str, fields: Iterable[str]) -> Dict[str, str]:
+    """
+    Get the drafted sections of a report stored with cache_section.
+
+    Args:
+        key: Report cache key
+        fields: Report fields to look up
+
+    Returns:
+        Cached section contents keyed by report field; missing sections are omitted
+    """
+    fields = list(fields)
+    contents = await asyncio.gather(*[get_cached_async(f"report_section:{key}:{field}") for field in fields])
+    return {field: content for field, content in zip(fields, contents) if content is not None}
+
+
+async def cache_section(key: str, field: str, content: str) -> None:
+    """
+    Store a drafted section, so that a rerun after a failed section only regenerates that section.
+
+    Args:
+        key: Report cache key
+        field: Report field of the section
+        content: Markdown content of the section
+    """
+    await set_cached_async(f"report_section:{key}:{field}", content, REPORT_TTL)
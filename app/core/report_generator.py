@@ -5,15 +5,50 @@ import logging
 from typing import Dict, Any, List
 import asyncio
 
+from app.constants import REPORT_SYSTEM_PROMPT, SECTION_TIMEOUT
+from app.core.llm_api_wrapper import LLMAPIWrapper
 from app.data_sources.openai_websearch import OpenaiWebSearch
 from app.data_sources.search_sources import SerperDataSource, PerplexityDataSource
 from app.data_sources.scraper_sources import ScraperAPIDataSource
 from app.data_sources.linkedin_source import CoreSignalDataSource
 from app.data_sources.funding_source import TracxnDataSource
-from app.models.job import Job, JobStatus, jobs_db
-from app.models.report import Report
+from app.models.job import JobStatus, get_job, put_job
+from app.models.report import ReportModel
 from app.utils.url_parser import extract_company_name_from_url
 from app.processors.llm_processor import LLMProcessor
+from app.processors.report_polisher import polish_report
+from app.utils.data_utils import canonical_json
+
+
+REPORT_SECTIONS_PROMPT = """Using the structured company information provided above, write all sections of the company report.
+Fill each field of the response with the Markdown content of the corresponding section:
+
+## company_overview
+A concise but informative company overview in 4-6 lines: business model, geography, stage, and uniqueness.
+
+## product_business_model
+The company's products, services, revenue streams and key characteristics,
+in a tabular or text form depending on the company type (consumer goods, SaaS, e-commerce, etc.).
+
+## market_analysis
+Total Addressable Market (TAM), market segments, CAGR (Compound Annual Growth Rate), and geographic expansion.
+If exact figures are not available, provide reasonable estimates based on the industry and similar companies.
+
+## competitive_landscape
+Direct competitors and their metrics (valuation, revenue, customers, geographic presence), indirect competitors if relevant.
+A table of competitors and a brief description of market saturation.
+
+## financial_metrics
+Key metrics such as Revenue, EBITDA, GMV, MRR/ARR, and number of customers, in a table if possible.
+If specific figures are not available, provide estimates based on available data or industry benchmarks.
+
+## fundraising_history
+Funding rounds with dates, investment amounts, and company valuations, as a chronological table with the most recent rounds first.
+
+## team_key_stakeholders
+Key employees and investors with their roles and experience, and the relevance of their experience and achievements.
+Use separate subsections for management team and investors.
+"""
 
 
 class ReportGenerator:
@@ -21,14 +56,15 @@ class ReportGenerator:
 
     def __init__(self):
         """Initialize the report generator with necessary data sources."""
+        self.logger = logging.getLogger(__name__)
+        self.llm = LLMAPIWrapper()
+        self.web_search = OpenaiWebSearch(self.llm, self.logger)
         self.serper_source = SerperDataSource()
-        self.web_search = OpenaiWebSearch(self.logger, self.llm)
         self.perplexity_source = PerplexityDataSource()
         self.scraper_source = ScraperAPIDataSource()
         self.linkedin_source = CoreSignalDataSource()
         self.tracxn_source = TracxnDataSource()
-        self.llm_processor = LLMProcessor()
-        self.logger = logging.getLogger(__name__)
+        self.llm_processor = LLMProcessor(llm=self.llm)
 
     async def generate_report_async(self, job_id: str, url: str) -> None:
         """
@@ -40,14 +76,17 @@ class ReportGenerator:
         """
         try:
             # Update job status to processing
-            job = jobs_db[job_id]
+            job = await get_job(job_id)
+            if job is None:
+                self.logger.error(f"Job {job_id} not found")
+                return
             job.status = JobStatus.PROCESSING
+            await put_job(job)
 
             # Extract company name from URL
             company_name = extract_company_name_from_url(url)
             self.logger.info(f"Generating report for {company_name} ({url}), job_id: {job_id}")
 
-            serper_data = await self.serper_source.fetch_data(company_name, url)
             # Collect data from all sources concurrently
             tasks = [
                 self.serper_source.fetch_data(company_name, url),
@@ -76,18 +115,35 @@ class ReportGenerator:
             # Update job with completed report
             job.report = report
             job.status = JobStatus.COMPLETED
-            jobs_db[job_id] = job
+            await put_job(job)
 
             self.logger.info(f"Report generation completed for job {job_id}")
 
         except Exception as e:
             self.logger.error(f"Error generating report for job {job_id}: {str(e)}")
             # Update job status to failed
-            if job_id in jobs_db:
-                job = jobs_db[job_id]
+            job = await get_job(job_id)
+            if job is not None:
                 job.status = JobStatus.FAILED
                 job.error = str(e)
-                jobs_db[job_id] = job
+                await put_job(job)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the data sources and the LLM processor
+        (the HTTP client shared by the data sources stays open).
+        """
+        await asyncio.gather(
+            self.serper_source.close(),
+            self.perplexity_source.close(),
+            self.scraper_source.close(),
+            self.linkedin_source.close(),
+            self.tracxn_source.close(),
+            self.llm_processor.close(),
+            return_exceptions=True
+        )
 
     def _safe_extract(self, results: List[Any], index: int) -> Dict[str, Any]:
         """
@@ -109,9 +165,12 @@ class ReportGenerator:
 
         return result
 
-    async def _generate_report_sections(self, raw_data: Dict[str, Any]) -> Report:
+    async def _generate_report_sections(self, raw_data: Dict[str, Any]) -> ReportModel:
         """
-        Generate report sections using the LLM processor.
+        Generate report sections with a single structured output LLM call.
+        If that call fails, the sections are generated separately by the LLM processor.
+        Either way the report goes through the same final polish pass, so a job's report is finished
+        the same way whichever path produced it.
 
         Args:
             raw_data: Combined raw data from all sources
@@ -119,28 +178,41 @@ class ReportGenerator:
         Returns:
             Structured Report object with all sections
         """
-        # Generate each section concurrently
-        tasks = [
-            self.llm_processor.generate_company_overview(raw_data),
-            self.llm_processor.generate_product_business_model(raw_data),
-            self.llm_processor.generate_market_analysis(raw_data),
-            self.llm_processor.generate_competitive_landscape(raw_data),
-            self.llm_processor.generate_financial_metrics(raw_data),
-            self.llm_processor.generate_fundraising_history(raw_data),
-            self.llm_processor.generate_team_stakeholders(raw_data)
-        ]
-
-        results = await asyncio.gather(*tasks)
-
-        # Create the report object
-        report = Report(
-            company_overview=results[0],
-            product_business_model=results[1],
-            market_analysis=results[2],
-            competitive_landscape=results[3],
-            financial_metrics=results[4],
-            fundraising_history=results[5],
-            team_key_stakeholders=results[6]
+        # All sections in one structured output call: the raw data is sent once instead of seven times
+        context = canonical_json(raw_data)
+        try:
+            report = await self.llm.get_parsed_response(
+                prompt=REPORT_SECTIONS_PROMPT,
+                response_format=ReportModel,
+                system_prompt=REPORT_SYSTEM_PROMPT,
+                max_tokens=16384,
+                context=context
+            )
+            if report is not None:
+                return await polish_report(self.llm, report)
+            self.logger.warning("Structured report generation was refused, generating sections separately")
+        except Exception as e:
+            self.logger.warning(f"Structured report generation failed, generating sections separately: {e}")
+
+        # Fall back to generating each section concurrently; a failed or timed out section is left empty
+        sections = {
+            "company_overview": self.llm_processor.generate_company_overview,
+            "product_business_model": self.llm_processor.generate_product_business_model,
+            "market_analysis": self.llm_processor.generate_market_analysis,
+            "competitive_landscape": self.llm_processor.generate_competitive_landscape,
+            "financial_metrics": self.llm_processor.generate_financial_metrics,
+            "fundraising_history": self.llm_processor.generate_fundraising_history,
+            "team_key_stakeholders": self.llm_processor.generate_team_stakeholders,
+        }
+        results = await asyncio.gather(
+            *[asyncio.wait_for(generate(raw_data), SECTION_TIMEOUT) for generate in sections.values()],
+            return_exceptions=True
         )
 
-        return report
+        contents = {}
+        for field, result in zip(sections, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error generating section {field}: {result!r}")
+            else:
+                contents[field] = result
+        return await polish_report(self.llm, ReportModel(**contents))
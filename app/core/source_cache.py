@@ -0,0 +1,122 @@
+"""
+Persistent cache of data source results, keyed by source and company domain.
+"""
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Dict
+
+import diskcache
+
+from app.constants import settings
+from app.utils.url_parser import extract_domain_from_url
+
+# Time to live of cached results per kind of source, in seconds
+SEARCH_RESULTS_TTL = 24 * 3600
+RESEARCH_RESULTS_TTL = 7 * 24 * 3600
+SCRAPED_PAGES_TTL = 7 * 24 * 3600
+# Market figures (TAM, CAGR, ...) move slowly and are shared by companies of the same market
+MARKET_SEARCH_TTL = 14 * 24 * 3600
+
+_cache = diskcache.Cache(settings.source_cache_dir, size_limit=5_000_000_000)
+
+# Background refreshes of stale entries in flight, keyed by cache key
+_refreshing: Dict[str, asyncio.Task] = {}
+
+
+def _has_error(value: Dict[str, Any]) -> bool:
+    """Check whether a result (or one of its sections) carries an error."""
+    return "error" in value or any(isinstance(v, dict) and "error" in v for v in value.values())
+
+
+def _on_refresh_done(key: str, task: asyncio.Task) -> None:
+    _refreshing.pop(key, None)
+    if not task.cancelled() and task.exception():
+        logging.warning(f"Refreshing cached source result {key} failed: {task.exception()}")
+
+
+def get_cached(key: str) -> Any:
+    """
+    Get a value stored with set_cached.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        The value, or None on a miss
+    """
+    return _cache.get(key)
+
+
+def set_cached(key: str, value: Any, ttl: int) -> None:
+    """
+    Store a value that is not tied to a single company, e.g. a search result shared across reports.
+
+    Args:
+        key: Cache key
+        value: Value to store
+        ttl: Time to live in seconds
+    """
+    _cache.set(key, value, expire=ttl)
+
+
+async def get_cached_async(key: str) -> Any:
+    """
+    Get a value stored with set_cached, reading the cache in a worker thread.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        The value, or None on a miss
+    """
+    return await asyncio.to_thread(_cache.get, key)
+
+
+async def set_cached_async(key: str, value: Any, ttl: int) -> None:
+    """
+    Store a value like set_cached, writing the cache in a worker thread so that the
+    SQLite commit of diskcache does not block the event loop.
+
+    Args:
+        key: Cache key
+        value: Value to store
+        ttl: Time to live in seconds
+    """
+    await asyncio.to_thread(_cache.set, key, value, expire=ttl)
+
+
+def cached_source(ttl: int = 86400, stale_ttl: int = 0):
+    """
+    Cache the result of a data source's fetch_data(company_name, url) on disk.
+    The key uses the domain rather than the full URL, so trailing-slash or query-string
+    variants of the same company URL share an entry. Results with an error are not cached.
+
+    Args:
+        ttl: Time in seconds during which a cached result is fresh
+        stale_ttl: Time in seconds after expiry during which a stale result is still returned,
+            while it is refreshed in the background (stale-while-revalidate)
+    """
+    def decorator(fetch_data):
+        async def refresh(self, company_name: str, url: str, key: str):
+            value = await fetch_data(self, company_name, url)
+            if not _has_error(value):
+                _cache.set(key, (time.time(), value), expire=ttl + stale_ttl)
+            return value
+
+        @functools.wraps(fetch_data)
+        async def wrapper(self, company_name: str, url: str):
+            key = f"{type(self).__name__}:{extract_domain_from_url(url)}"
+            entry = _cache.get(key)
+            if entry is None:
+                return await refresh(self, company_name, url, key)
+
+            stored_at, value = entry
+            if time.time() - stored_at > ttl and key not in _refreshing:
+                task = asyncio.create_task(refresh(self, company_name, url, key))
+                _refreshing[key] = task
+                task.add_done_callback(functools.partial(_on_refresh_done, key))
+            return value
+        return wrapper
+    return decorator
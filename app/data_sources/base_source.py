@@ -1,9 +1,26 @@
 """
 Base data source interface for Company Screener.
 """
+import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 
+import httpx
+
+# Hosts for which the negotiated HTTP version has already been logged
+_logged_hosts = set()
+
+
+async def log_http_version(response: httpx.Response) -> None:
+    """
+    httpx response hook logging the HTTP version negotiated with each host once,
+    to make it visible whether requests are multiplexed over HTTP/2.
+    """
+    host = response.url.host
+    if host not in _logged_hosts:
+        _logged_hosts.add(host)
+        logging.getLogger(__name__).debug(f"{host} negotiated {response.http_version}")
+
 
 class BaseDataSource(ABC):
     """Base interface for all data sources."""
@@ -21,3 +38,15 @@ class BaseDataSource(ABC):
             Dictionary containing the fetched data
         """
         pass
+
+    async def close(self) -> None:
+        """
+        Release any resources held by the source (e.g. pooled HTTP connections).
+        """
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,93 @@
+"""
+HTTP client shared by all data sources.
+"""
+import asyncio
+from typing import Optional
+
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from app.data_sources.base_source import log_http_version
+
+# Upper bound of outbound requests in flight across all data sources and jobs
+MAX_IN_FLIGHT_REQUESTS = 50
+
+# Client errors worth retrying (request timeout, rate limit); other 4xx are final
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+
+_client: Optional[httpx.AsyncClient] = None
+
+request_slots = asyncio.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Check whether a failed request is worth retrying: timeouts, connection errors,
+    5xx responses and the statuses in RETRYABLE_CLIENT_STATUSES.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status in RETRYABLE_CLIENT_STATUSES
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
+
+
+# Up to 3 attempts with exponential backoff; the last error is re-raised as is
+api_retry = retry(
+    wait=wait_exponential(multiplier=0.5, max=5),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception(is_retryable),
+    reraise=True
+)
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+    Sharing one connection pool keeps connections to the same API alive across sources and jobs
+    and bounds the total number of open sockets. Sources pass their own auth headers per request.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(connect=5.0, read=20.0, write=10.0, pool=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            event_hooks={"response": [log_http_version]}
+        )
+    return _client
+
+
+@api_retry
+async def send_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request with the shared client, retrying transient failures.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        **kwargs: Further arguments of httpx.AsyncClient.request (headers, content, params, timeout...)
+
+    Returns:
+        Successful response
+
+    Raises:
+        httpx.HTTPStatusError: If the final response has an error status
+        httpx.HTTPError: If the request could not be completed
+    """
+    async with request_slots:
+        response = await get_client().request(method, url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def shutdown_http_client() -> None:
+    """
+    Close the shared HTTP client (called on application shutdown).
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
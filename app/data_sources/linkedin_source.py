@@ -1,11 +1,27 @@
 """
 LinkedIn data source via CoreSignal API.
 """
+import asyncio
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import httpx
+import orjson
 
+from app.core.source_cache import cached_source
 from app.data_sources.base_source import BaseDataSource
+from app.data_sources.http_client import send_request
+
+# The key employees query does not depend on the company, so it is serialized once
+EMPLOYEES_PAYLOAD = orjson.dumps({
+    "limit": 20,
+    "filters": {
+        "position_title": {
+            "contains_any": ["CEO", "CTO", "CFO", "COO", "Chief",
+                             "Director", "VP", "Head", "President",
+                             "Founder", "Co-founder"]
+        }
+    }
+})
 
 
 class CoreSignalDataSource(BaseDataSource):
@@ -28,6 +44,7 @@ class CoreSignalDataSource(BaseDataSource):
             "Content-Type": "application/json"
         }
 
+    @cached_source()
     async def fetch_data(self, company_name: str, url: str) -> Dict[str, Any]:
         """
         Fetch LinkedIn data for a company.
@@ -44,77 +61,58 @@ class CoreSignalDataSource(BaseDataSource):
             "employees": []
         }
 
-        async with httpx.AsyncClient() as client:
-            # First, search for the company profile
-            search_url = f"{self.base_url}/linkedin/company/search"
-            search_payload = {
-                "query": company_name,
-                "limit": 1  # Just the top match
+        # First, search for the company profile
+        search_url = f"{self.base_url}/linkedin/company/search"
+        search_payload = orjson.dumps({
+            "query": company_name,
+            "limit": 1  # Just the top match
+        })
+
+        try:
+            response = await send_request("POST", search_url, content=search_payload, headers=self.headers)
+            search_results = orjson.loads(response.content)
+
+            if not search_results.get("results"):
+                return results
+
+            company_id = search_results["results"][0]["id"]
+
+            # Get detailed company information
+            company_url = f"{self.base_url}/linkedin/company/{company_id}"
+            company_response = await send_request("GET", company_url, headers=self.headers)
+            results["company_profile"] = orjson.loads(company_response.content)
+
+            # Get key employees (executives, managers)
+            employees_url = f"{self.base_url}/linkedin/company/{company_id}/employees"
+            employees_response = await send_request("POST", employees_url, content=EMPLOYEES_PAYLOAD, headers=self.headers)
+            results["employees"] = orjson.loads(employees_response.content).get("results", [])
+
+            # For key employees, get their detailed profiles concurrently
+            top_employees = results["employees"][:10]  # Limit to top 10 employees to avoid API overuse
+            profiles = await asyncio.gather(*[self._fetch_profile(e["id"]) for e in top_employees])
+            for employee, profile in zip(top_employees, profiles):
+                employee["detailed_profile"] = profile
+
+        except httpx.HTTPStatusError as e:
+            results["error"] = {
+                "status_code": e.response.status_code,
+                "message": str(e)
             }
 
-            try:
-                response = await client.post(
-                    search_url,
-                    headers=self.headers,
-                    json=search_payload
-                )
-                response.raise_for_status()
-                search_results = response.json()
-
-                if not search_results.get("results"):
-                    return results
-
-                company_id = search_results["results"][0]["id"]
-
-                # Get detailed company information
-                company_url = f"{self.base_url}/linkedin/company/{company_id}"
-                company_response = await client.get(company_url, headers=self.headers)
-                company_response.raise_for_status()
-                results["company_profile"] = company_response.json()
-
-                # Get key employees (executives, managers)
-                employees_url = f"{self.base_url}/linkedin/company/{company_id}/employees"
-                employees_payload = {
-                    "limit": 20,
-                    "filters": {
-                        "position_title": {
-                            "contains_any": ["CEO", "CTO", "CFO", "COO", "Chief",
-                                           "Director", "VP", "Head", "President",
-                                           "Founder", "Co-founder"]
-                        }
-                    }
-                }
-
-                employees_response = await client.post(
-                    employees_url,
-                    headers=self.headers,
-                    json=employees_payload
-                )
-                employees_response.raise_for_status()
-                results["employees"] = employees_response.json().get("results", [])
-
-                # For each key employee, get their detailed profile
-                for i, employee in enumerate(results["employees"]):
-                    if i >= 10:  # Limit to top 10 employees to avoid API overuse
-                        break
-
-                    employee_id = employee["id"]
-                    profile_url = f"{self.base_url}/linkedin/person/{employee_id}"
-
-                    try:
-                        profile_response = await client.get(
-                            profile_url,
-                            headers=self.headers
-                        )
-                        profile_response.raise_for_status()
-                        results["employees"][i]["detailed_profile"] = profile_response.json()
-                    except httpx.HTTPStatusError:
-                        results["employees"][i]["detailed_profile"] = None
-
-            except httpx.HTTPStatusError as e:
-                results["error"] = {
-                    "status_code": e.response.status_code,
-                    "message": str(e)
-                }
-
         return results
+
+    async def _fetch_profile(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the detailed LinkedIn profile of an employee.
+
+        Args:
+            employee_id: CoreSignal person ID
+
+        Returns:
+            Profile data, or None if the profile could not be fetched
+        """
+        try:
+            response = await send_request("GET", f"{self.base_url}/linkedin/person/{employee_id}", headers=self.headers)
+            return orjson.loads(response.content)
+        except httpx.HTTPStatusError:
+            return None
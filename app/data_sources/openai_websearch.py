@@ -1,7 +1,7 @@
 import json
 import re
+from string import Template
 
-from langchain_core.utils.json import parse_json_markdown
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
@@ -12,6 +12,14 @@ from app.core.llm_api_wrapper import LLMAPIWrapper
 
 SEARCH_MODEL = "gpt-4o-search-preview"
 
+_UTM_RE = re.compile(r'\?utm_[^&\s\)]*')
+_MD_LINK_RE = re.compile(r'\[.*?\]\((https?://[^\s\)]+)\)')
+_PLAIN_LINK_RE = re.compile(r'(?<!\()(?<!\])\bhttps?://[^\s\)]+')
+# Opening ```json fence directly followed by the JSON object
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(?=\{)')
+# Accepts raw newlines and tabs inside strings, which LLMs often emit
+_JSON_DECODER = json.JSONDecoder(strict=False)
+
 class WebSearchResponse(BaseModel):
     content: str = Field(
         description="The answer to the topic, found on the specified company website. If not found, use 'N/A'."
@@ -21,10 +29,10 @@ class WebSearchResponse(BaseModel):
     )
 
 
-SEARCH_WEBSITE_PROMPT = (
-    """Search web pages for topic: '{topic}' from a company website '{website_url}'
+SEARCH_WEBSITE_PROMPT = Template(
+    """Search web pages for topic: '$topic' from a company website '$website_url'
 Also return the webpage link your found the required information on
-1. Search for pages only within '{website_url}' domain
+1. Search for pages only within '$website_url' domain
 2. Return a clear answer to the topic. If the topic is not present on the website, return N/A
 3. No pre-text or post-text, just the answer
 The output must be the following json:
@@ -35,8 +43,8 @@ The output must be the following json:
 }"""
 )
 
-SEARCH_WEB_PROMPT = (
-    """Search web for topic: '{topic}'
+SEARCH_WEB_PROMPT = Template(
+    """Search web for topic: '$topic'
 Also return the webpage links your found the required information on
 1. Return a clear answer to the topic. If the topic is not present on the website, return N/A
 2. No pre-text or post-text, just the answer
@@ -49,16 +57,29 @@ The output must be the following json:
 )
 
 
+def parse_json_response(text: str) -> dict:
+    """
+    Parse the JSON object from an LLM response, which may be wrapped in a Markdown code block.
+    Only the fenced object, or the first object in the text, is decoded, so prose after it may contain braces.
+    """
+    match = _JSON_FENCE_RE.search(text)
+    start = match.end() if match else text.find("{")
+    if start < 0:
+        return json.loads(text, strict=False)
+    data, _ = _JSON_DECODER.raw_decode(text, start)
+    return data
+
+
 def strip_utm_source(url):
-    return re.split(r'\?utm_[^&\s\)]*', url)[0]
+    return _UTM_RE.split(url, maxsplit=1)[0]
 
 
 def extract_clean_links(text):
     # Extract Markdown links like [text](https://example.com)
-    markdown_links = re.findall(r'\[.*?\]\((https?://[^\s\)]+)\)', text)
+    markdown_links = _MD_LINK_RE.findall(text)
 
     # Extract plain links (not in Markdown format)
-    plain_links = re.findall(r'(?<!\()(?<!\])\bhttps?://[^\s\)]+', text)
+    plain_links = _PLAIN_LINK_RE.findall(text)
 
     all_links = markdown_links + plain_links
     clean_links = []
@@ -79,11 +100,7 @@ class OpenaiWebSearch:
         # self.model = OpenAIModel("gpt-4o-search-preview", provider=provider)
 
     async def search_on_website_pydai(self, topic: str, website_url: str) -> WebSearchResponse:
-        prompt = SEARCH_WEBSITE_PROMPT.replace(
-            "{topic}", topic
-        ).replace(
-            "{website_url}", website_url
-        )
+        prompt = SEARCH_WEBSITE_PROMPT.substitute(topic=topic, website_url=website_url)
         agent = Agent(model=self.model)
         try:
             response = await agent.run(
@@ -96,19 +113,16 @@ class OpenaiWebSearch:
         return response
 
     async def search_on_website(self, topic: str, website_url: str) -> WebSearchResponse:
-        prompt = SEARCH_WEBSITE_PROMPT.replace(
-            "{topic}", topic
-        ).replace(
-            "{website_url}", website_url
-        )
+        prompt = SEARCH_WEBSITE_PROMPT.substitute(topic=topic, website_url=website_url)
 
         try:
             response = await self.llm.get_response(
                 model=SEARCH_MODEL,
                 prompt=prompt,
+                cache_scope=website_url,
             )
 
-            data = parse_json_markdown(response)
+            data = parse_json_response(response)
             result = WebSearchResponse(**data)
         except Exception as e:
             self.logger.error(f"Error during web search: {e}")
@@ -117,20 +131,19 @@ class OpenaiWebSearch:
         return result
 
     async def search_on_web(self, topic: str) -> WebSearchResponse:
-        prompt = SEARCH_WEB_PROMPT.replace(
-            "{topic}", topic
-        )
+        prompt = SEARCH_WEB_PROMPT.substitute(topic=topic)
 
         try:
             response = await self.llm.get_response(
                 model=SEARCH_MODEL,
                 prompt=prompt,
+                cache_scope=topic,
             )
 
             if isinstance(response, dict):
                 response = response.get("content", "")
 
-            data = parse_json_markdown(response)
+            data = parse_json_response(response)
             result = WebSearchResponse(**data)
         except Exception as e:
             self.logger.error(f"Error during web search: {e}")
@@ -1,11 +1,14 @@
 """
 Research-based data source using Perplexity API.
 """
+import asyncio
 import os
 from typing import Dict, Any
-import httpx
+import orjson
 
+from app.core.source_cache import cached_source, RESEARCH_RESULTS_TTL
 from app.data_sources.base_source import BaseDataSource
+from app.data_sources.http_client import send_request
 
 
 class PerplexityDataSource(BaseDataSource):
@@ -28,6 +31,7 @@ class PerplexityDataSource(BaseDataSource):
             "Content-Type": "application/json"
         }
 
+    @cached_source(ttl=RESEARCH_RESULTS_TTL, stale_ttl=RESEARCH_RESULTS_TTL)
     async def fetch_data(self, company_name: str, url: str) -> Dict[str, Any]:
         """
         Fetch research data about a company.
@@ -40,44 +44,34 @@ class PerplexityDataSource(BaseDataSource):
             Dict containing research data
         """
         research_queries = [
-            f"Detailed analysis of {company_name}'s business model and products",
-            f"{company_name} market size, TAM, and growth potential",
-            f"{company_name} competitors and competitive landscape",
-            f"{company_name} financial performance and key metrics",
-            f"{company_name} funding history and investors",
-            f"{company_name} leadership team background and experience"
+            ("business_model", f"Detailed analysis of {company_name}'s business model and products"),
+            ("market_analysis", f"{company_name} market size, TAM, and growth potential"),
+            ("competitive_landscape", f"{company_name} competitors and competitive landscape"),
+            ("financial_metrics", f"{company_name} financial performance and key metrics"),
+            ("fundraising", f"{company_name} funding history and investors"),
+            ("team", f"{company_name} leadership team background and experience")
         ]
 
+        # The queries are independent, so run them concurrently and keep partial results on failure
+        responses = await asyncio.gather(
+            *[self._search(query) for _, query in research_queries],
+            return_exceptions=True
+        )
+
         results = {}
-        async with httpx.AsyncClient() as client:
-            for query in research_queries:
-                payload = {
-                    "query": query,
-                    "focus": "search"
-                }
-                response = await client.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
+        for (category, _), response in zip(research_queries, responses):
+            if isinstance(response, Exception):
+                results[category] = {"error": str(response)}
+            else:
+                results[category] = response
 
-                # Extract category from query and store results
-                if "business model" in query:
-                    category = "business_model"
-                elif "market" in query:
-                    category = "market_analysis"
-                elif "competitors" in query:
-                    category = "competitive_landscape"
-                elif "financial" in query:
-                    category = "financial_metrics"
-                elif "funding" in query:
-                    category = "fundraising"
-                elif "leadership" in query:
-                    category = "team"
-                else:
-                    category = "general"
+        return results
 
-                results[category] = response.json()
+    async def _search(self, query: str) -> Dict[str, Any]:
+        payload = orjson.dumps({
+            "query": query,
+            "focus": "search"
+        })
+        response = await send_request("POST", self.base_url, content=payload, headers=self.headers)
+        return orjson.loads(response.content)
 
-        return results
@@ -1,13 +1,132 @@
 """
 Web scraping data source using ScraperAPI.
 """
+import asyncio
 import os
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import httpx
 from urllib.parse import urlparse, urljoin
 
+from app.core.source_cache import cached_source, SCRAPED_PAGES_TTL
 from app.data_sources.base_source import BaseDataSource
+from app.data_sources.http_client import api_retry, get_client, request_slots
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Maximum number of pages rendered by ScraperAPI at the same time for one company
+MAX_CONCURRENT_PAGES = 5
+
+# Rendered pages larger than this are truncated before parsing
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Rendering pages with JavaScript can take a while
+RENDER_TIMEOUT = 70.0
+
+# Timeout of the HEAD requests checking whether a guessed page exists
+PROBE_TIMEOUT = 10.0
+
+# Statuses of a probed page meaning it does not exist; anything else is worth rendering
+MISSING_PAGE_STATUSES = {404, 410}
+
+# Patterns of the text extraction, compiled once rather than looked up on every page
+_SCRIPT_RE = re.compile(r'<script.*?</script>', re.DOTALL)
+_STYLE_RE = re.compile(r'<style.*?</style>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(html: str) -> str:
+    """
+    Extract the visible text of an HTML page.
+    Uses the selectolax Lexbor parser when available and falls back to regex stripping otherwise.
+
+    Args:
+        html: Raw HTML content
+
+    Returns:
+        Text content with whitespace collapsed
+    """
+    if LexborHTMLParser is None:
+        # Remove script and style elements, then the remaining tags
+        text = _TAG_RE.sub(' ', _STYLE_RE.sub('', _SCRIPT_RE.sub('', html)))
+        return _WHITESPACE_RE.sub(' ', text).strip()
+
+    tree = LexborHTMLParser(html)
+    for node in tree.css("script, style, noscript"):
+        node.decompose()
+    if tree.body is None:
+        return ""
+    return _WHITESPACE_RE.sub(' ', tree.body.text(separator=" ")).strip()
+
+def page_error(page_url: str, error: Exception) -> Dict[str, Any]:
+    """
+    Describe a page that could not be fetched, recorded under a <page>_error key of the results.
+    Results holding such entries are not cached, so the page is fetched again on the next request.
+
+    Args:
+        page_url: Absolute URL of the page
+        error: Exception raised while fetching the page
+
+    Returns:
+        Dict with the page URL, the error message and the status code if there was a response
+    """
+    error_info = {"url": page_url, "error": str(error)}
+    if isinstance(error, httpx.HTTPStatusError):
+        error_info["status_code"] = error.response.status_code
+    return error_info
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """
+    Extract the links of an HTML page that point to the same host.
+
+    Args:
+        html: Raw HTML content
+        base_url: URL of the page, used to resolve relative links
+
+    Returns:
+        Absolute link URLs without fragments
+    """
+    if LexborHTMLParser is None:
+        hrefs = re.findall(r'<a\s[^>]*href=["\']([^"\']+)["\']', html, flags=re.IGNORECASE)
+    else:
+        hrefs = [node.attributes.get("href") for node in LexborHTMLParser(html).css("a[href]")]
+
+    host = urlparse(base_url).netloc
+    links = []
+    for href in hrefs:
+        if not href:
+            continue
+        link = urljoin(base_url, href).split("#", 1)[0]
+        if urlparse(link).netloc == host:
+            links.append(link)
+    return links
+
+
+def match_page_links(links: List[str], target_paths: Dict[str, str]) -> Dict[str, str]:
+    """
+    Map page types to actual links whose last path segment matches the target path
+    (e.g. https://example.com/company/about for "/about").
+
+    Args:
+        links: Absolute link URLs
+        target_paths: Target paths by page type
+
+    Returns:
+        Link URL by page type for the page types found among the links
+    """
+    page_types = {path.strip("/"): page_type for page_type, path in target_paths.items() if path != "/"}
+    found = {}
+    for link in links:
+        segment = urlparse(link).path.rstrip("/").rsplit("/", 1)[-1].lower()
+        page_type = page_types.get(segment)
+        if page_type and page_type not in found:
+            found[page_type] = link
+    return found
 
 
 class ScraperSource(BaseDataSource):
@@ -24,11 +143,17 @@ class ScraperSource(BaseDataSource):
         if not self.api_key:
             raise ValueError("ScraperAPI key is required")
 
-        self.base_url = "http://api.scraperapi.com"
+        # HTTPS is required for HTTP/2, which lets the concurrent page fetches share one connection
+        self.base_url = "https://api.scraperapi.com"
+        self._client = get_client()
 
+    @cached_source(ttl=SCRAPED_PAGES_TTL, stale_ttl=SCRAPED_PAGES_TTL)
     async def fetch_data(self, company_name: str, url: str) -> Dict[str, Any]:
         """
         Scrape key pages from a company website.
+        The home page is rendered first and its links are used to locate the other pages.
+        Pages not linked from the home page are probed with a HEAD request to the site itself,
+        so that rendering credits are only spent on pages that exist.
 
         Args:
             company_name: The name of the company
@@ -54,72 +179,127 @@ class ScraperSource(BaseDataSource):
             "careers": "/careers"
         }
 
+        # Rendered page fetches are slow; the semaphore keeps us within the ScraperAPI concurrency quota
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
         results = {}
-        async with httpx.AsyncClient() as client:
-            for page_type, path in target_paths.items():
-                full_url = urljoin(base_url, path)
-                params = {
-                    "api_key": self.api_key,
-                    "url": full_url,
-                    "render": "true"  # Enable JavaScript rendering
-                }
-
-                try:
-                    response = await client.get(self.base_url, params=params)
-                    response.raise_for_status()
-                    results[page_type] = {
-                        "url": full_url,
-                        "html": response.text
-                    }
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        # Page not found, this is normal for some paths
-                        continue
-                    else:
-                        # For other errors, add error info but continue
-                        results[f"{page_type}_error"] = {
-                            "url": full_url,
-                            "status_code": e.response.status_code,
-                            "error": str(e)
-                        }
-
-        # Extract key information from HTML content
-        cleaned_results = self._extract_key_info_from_html(results)
-
-        return cleaned_results
-
-    def _extract_key_info_from_html(self, raw_results: Dict[str, Any]) -> Dict[str, Any]:
+        discovered = {}
+        home_url = urljoin(base_url, target_paths["home"])
+        try:
+            home_html = await self._fetch_html(home_url, semaphore)
+        except httpx.HTTPError as e:
+            results["home_error"] = page_error(home_url, e)
+            home_html = None
+        if home_html is not None:
+            results["home"] = {
+                "url": home_url,
+                "text_content": html_to_text(home_html)
+            }
+            discovered = match_page_links(extract_links(home_html, home_url), target_paths)
+            del home_html
+
+        candidates = {
+            page_type: discovered.get(page_type, urljoin(base_url, path))
+            for page_type, path in target_paths.items()
+            if page_type != "home"
+        }
+        guessed = [page_type for page_type in candidates if page_type not in discovered]
+        exists = await asyncio.gather(*[self._page_exists(candidates[page_type], semaphore) for page_type in guessed])
+        for page_type, page_exists in zip(guessed, exists):
+            if not page_exists:
+                del candidates[page_type]
+
+        pages = await asyncio.gather(
+            *[self._fetch_page(page_url, semaphore) for page_url in candidates.values()],
+            return_exceptions=True
+        )
+
+        # Only the extracted text is kept; missing pages are skipped and failed ones recorded as <page>_error
+        for page_type, page in zip(candidates, pages):
+            if isinstance(page, Exception):
+                results[f"{page_type}_error"] = page_error(candidates[page_type], page)
+            elif page is not None:
+                results[page_type] = page
+        return results
+
+    async def _page_exists(self, page_url: str, semaphore: asyncio.Semaphore) -> bool:
         """
-        Extract key information from raw HTML content.
+        Probe a page on the company website with a HEAD request.
 
         Args:
-            raw_results: Dictionary containing raw HTML content by page type
+            page_url: Absolute URL of the page
+            semaphore: Semaphore bounding the number of concurrent requests of the scrape
 
         Returns:
-            Dictionary with extracted key information
+            False if the site reports the page as missing, True otherwise (including when the probe fails)
         """
-        cleaned_data = {}
+        try:
+            async with semaphore, request_slots:
+                response = await self._client.head(page_url, follow_redirects=True, timeout=PROBE_TIMEOUT)
+        except httpx.HTTPError:
+            return True
+        return response.status_code not in MISSING_PAGE_STATUSES
+
+    async def _fetch_html(self, full_url: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """
+        Fetch a single rendered page through ScraperAPI.
+        The body is streamed and truncated at MAX_PAGE_BYTES; transient failures are retried.
+
+        Args:
+            full_url: Absolute URL of the page
+            semaphore: Semaphore bounding the number of concurrent requests
 
-        for page_type, data in raw_results.items():
-            if "error" in page_type or "html" not in data:
-                continue
+        Returns:
+            Page HTML, or None if the page does not exist
 
-            html = data["html"]
+        Raises:
+            httpx.HTTPError: If the page could not be rendered for another reason
+        """
+        params = {
+            "api_key": self.api_key,
+            "url": full_url,
+            "render": "true"  # Enable JavaScript rendering
+        }
 
-            # Extract text content (basic implementation)
-            # Remove script and style elements
-            html_no_scripts = re.sub(r'<script.*?</script>', '', html, flags=re.DOTALL)
-            html_no_styles = re.sub(r'<style.*?</style>', '', html_no_scripts, flags=re.DOTALL)
+        try:
+            async with semaphore:
+                return await self._render(params)
+        except httpx.HTTPStatusError as e:
+            # Page not found is normal for some paths, other errors are reported to the caller
+            if e.response.status_code in MISSING_PAGE_STATUSES:
+                return None
+            raise
 
-            # Extract text from HTML
-            text = re.sub(r'<[^>]+>', ' ', html_no_styles)
+    @api_retry
+    async def _render(self, params: Dict[str, str]) -> str:
+        """Render a page with ScraperAPI and return its (possibly truncated) HTML."""
+        async with request_slots:
+            async with self._client.stream("GET", self.base_url, params=params, timeout=RENDER_TIMEOUT) as response:
+                response.raise_for_status()
+                html = bytearray()
+                async for chunk in response.aiter_bytes():
+                    html += chunk
+                    if len(html) >= MAX_PAGE_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
+        return html.decode(encoding, errors="replace")
 
-            # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
+    async def _fetch_page(self, full_url: str, semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single rendered page and extract its text right away, so raw HTML does not outlive this call.
 
-            cleaned_data[page_type] = {
-                "url": data["url"],
-                "text_content": text
-            }
+        Args:
+            full_url: Absolute URL of the page
+            semaphore: Semaphore bounding the number of concurrent requests
 
-        return cleaned_data
+        Returns:
+            Dict with the page URL and text content, or None if the page does not exist
+        """
+        html = await self._fetch_html(full_url, semaphore)
+        if html is None:
+            return None
+
+        return {
+            "url": full_url,
+            "text_content": html_to_text(html)
+        }
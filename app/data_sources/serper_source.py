@@ -1,11 +1,26 @@
 """
 Search-based data source using Serper API.
 """
+import asyncio
 import os
 from typing import Dict, Any
-import httpx
+import orjson
 
+from app.core.source_cache import cached_source, SEARCH_RESULTS_TTL
 from app.data_sources.base_source import BaseDataSource
+from app.data_sources.http_client import send_request
+
+# Each query is the company name followed by the query type, results are stored by query type
+SEARCH_QUERY_TYPES = (
+    "company overview",
+    "business model",
+    "products services",
+    "market size",
+    "competitors",
+    "revenue financial metrics",
+    "funding investment rounds",
+    "team executives management",
+)
 
 
 class SerperDataSource(BaseDataSource):
@@ -28,6 +43,7 @@ class SerperDataSource(BaseDataSource):
             "Content-Type": "application/json"
         }
 
+    @cached_source(ttl=SEARCH_RESULTS_TTL, stale_ttl=SEARCH_RESULTS_TTL)
     async def fetch_data(self, company_name: str, url: str) -> Dict[str, Any]:
         """
         Fetch search results for a company.
@@ -39,33 +55,27 @@ class SerperDataSource(BaseDataSource):
         Returns:
             Dict containing search results
         """
-        search_queries = [
-            f"{company_name} company overview",
-            f"{company_name} business model",
-            f"{company_name} products services",
-            f"{company_name} market size",
-            f"{company_name} competitors",
-            f"{company_name} revenue financial metrics",
-            f"{company_name} funding investment rounds",
-            f"{company_name} team executives management"
-        ]
+        search_queries = [(query_type, f"{company_name} {query_type}") for query_type in SEARCH_QUERY_TYPES]
 
-        results = {}
-        async with httpx.AsyncClient() as client:
-            for query in search_queries:
-                payload = {
-                    "q": query,
-                    "num": 10
-                }
-                response = await client.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
+        # The queries are independent, so run them concurrently and keep partial results on failure
+        responses = await asyncio.gather(
+            *[self._search(query) for _, query in search_queries],
+            return_exceptions=True
+        )
 
-                # Store results by query type
-                query_type = query.replace(f"{company_name} ", "")
-                results[query_type] = response.json()
+        results = {}
+        for (query_type, _), response in zip(search_queries, responses):
+            if isinstance(response, Exception):
+                results[query_type] = {"error": str(response)}
+            else:
+                results[query_type] = response
 
         return results
+
+    async def _search(self, query: str) -> Dict[str, Any]:
+        payload = orjson.dumps({
+            "q": query,
+            "num": 10
+        })
+        response = await send_request("POST", self.base_url, content=payload, headers=self.headers)
+        return orjson.loads(response.content)
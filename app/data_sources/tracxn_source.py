@@ -1,11 +1,20 @@
 """
 Funding data source using Tracxn API.
 """
+import asyncio
 import os
 from typing import Dict, Any
 import httpx
+import orjson
 
+from app.core.source_cache import cached_source
 from app.data_sources.base_source import BaseDataSource
+from app.data_sources.http_client import send_request
+
+# Fields of the company details the report sections rely on. The details call is skipped only when the
+# search hit has all of them, and company_details then holds just these fields, named as in the details
+# response, rather than the search hit with its different schema (which stays under company_info)
+DETAIL_FIELDS = ("description", "employee_count", "founded_year")
 
 
 class TracxnSource(BaseDataSource):
@@ -28,6 +37,7 @@ class TracxnSource(BaseDataSource):
             "Content-Type": "application/json"
         }
 
+    @cached_source()
     async def fetch_data(self, company_name: str, url: str) -> Dict[str, Any]:
         """
         Fetch funding and investor data for a company.
@@ -45,63 +55,62 @@ class TracxnSource(BaseDataSource):
             "investors": []
         }
 
-        async with httpx.AsyncClient() as client:
-            # Search for the company
-            search_url = f"{self.base_url}/companies/search"
-            search_payload = {
-                "query": company_name,
-                "limit": 5  # Get top 5 matches to find the right one
+        # Search for the company
+        search_url = f"{self.base_url}/companies/search"
+        search_payload = orjson.dumps({
+            "query": company_name,
+            "limit": 5  # Get top 5 matches to find the right one
+        })
+
+        try:
+            response = await send_request("POST", search_url, content=search_payload, headers=self.headers)
+            search_results = orjson.loads(response.content)
+
+            company_id = None
+            domain = url.replace("https://", "").replace("http://", "").split("/")[0]
+
+            # Try to find exact match by domain
+            for company in search_results.get("companies", []):
+                if company.get("domain") == domain:
+                    company_id = company.get("id")
+                    results["company_info"] = company
+                    break
+
+            # If no match by domain, use the first result
+            if not company_id and search_results.get("companies"):
+                company_id = search_results["companies"][0]["id"]
+                results["company_info"] = search_results["companies"][0]
+
+            if not company_id:
+                return results
+
+            # Funding rounds, investors and details are independent, fetch them concurrently.
+            # The details call is skipped when the search hit already has the detail fields.
+            company_info = results["company_info"]
+            fetch_details = not all(company_info.get(field) for field in DETAIL_FIELDS)
+            company_url = f"{self.base_url}/companies/{company_id}"
+            requests = [
+                send_request("GET", f"{company_url}/funding_rounds", headers=self.headers),
+                send_request("GET", f"{company_url}/investors", headers=self.headers),
+            ]
+            if fetch_details:
+                requests.append(send_request("GET", company_url, headers=self.headers))
+            responses = await asyncio.gather(*requests, return_exceptions=True)
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+
+            results["funding_rounds"] = orjson.loads(responses[0].content).get("fundingRounds", [])
+            results["investors"] = orjson.loads(responses[1].content).get("investors", [])
+            if fetch_details:
+                results["company_details"] = orjson.loads(responses[2].content)
+            else:
+                results["company_details"] = {field: company_info[field] for field in DETAIL_FIELDS}
+
+        except httpx.HTTPStatusError as e:
+            results["error"] = {
+                "status_code": e.response.status_code,
+                "message": str(e)
             }
 
-            try:
-                response = await client.post(
-                    search_url,
-                    headers=self.headers,
-                    json=search_payload
-                )
-                response.raise_for_status()
-                search_results = response.json()
-
-                company_id = None
-                domain = url.replace("https://", "").replace("http://", "").split("/")[0]
-
-                # Try to find exact match by domain
-                for company in search_results.get("companies", []):
-                    if company.get("domain") == domain:
-                        company_id = company.get("id")
-                        results["company_info"] = company
-                        break
-
-                # If no match by domain, use the first result
-                if not company_id and search_results.get("companies"):
-                    company_id = search_results["companies"][0]["id"]
-                    results["company_info"] = search_results["companies"][0]
-
-                if not company_id:
-                    return results
-
-                # Get company funding rounds
-                funding_url = f"{self.base_url}/companies/{company_id}/funding_rounds"
-                funding_response = await client.get(funding_url, headers=self.headers)
-                funding_response.raise_for_status()
-                results["funding_rounds"] = funding_response.json().get("fundingRounds", [])
-
-                # Get company investors
-                investors_url = f"{self.base_url}/companies/{company_id}/investors"
-                investors_response = await client.get(investors_url, headers=self.headers)
-                investors_response.raise_for_status()
-                results["investors"] = investors_response.json().get("investors", [])
-
-                # Get detailed company information
-                details_url = f"{self.base_url}/companies/{company_id}"
-                details_response = await client.get(details_url, headers=self.headers)
-                details_response.raise_for_status()
-                results["company_details"] = details_response.json()
-
-            except httpx.HTTPStatusError as e:
-                results["error"] = {
-                    "status_code": e.response.status_code,
-                    "message": str(e)
-                }
-
         return results
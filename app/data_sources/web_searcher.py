@@ -1,9 +1,24 @@
 import asyncio
+from typing import List, Optional, Tuple
 
 from app.core.llm_api_wrapper import LLMAPIWrapper
-from app.data_sources.openai_websearch import OpenaiWebSearch
+from app.data_sources.openai_websearch import OpenaiWebSearch, WebSearchResponse
 from app.models.job import ScreenerJob
 
+# Maximum number of web searches running at the same time for one company
+SEARCH_CONCURRENCY = 3
+
+# Timeout of a single web search in seconds
+SEARCH_TIMEOUT = 60
+
+INFO_TOPICS = {
+    "company_name": "What is the name of the company?",
+    "business_model": "What is the business model of the company? It can be B2B, B2C, C2C, etc.",
+    "products_services": "What products and/or services does the company offer?",
+    "market": "What market does the company work in?",
+    "team": "Who are the founders and team members of the company?"
+}
+
 
 class WebResearcher:
     def __init__(self, llm: LLMAPIWrapper, logger):
@@ -11,9 +26,10 @@ class WebResearcher:
         self.logger = logger
         # self.serp = SerpAPIWrapper(serpapi_api_key=SERPER_API_KEY)
         self.llm_searcher = OpenaiWebSearch(llm=llm, logger=logger)
+        self._semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
         # self.builder = PromptBuilder()
 
-    async def get_company_info(self, job: ScreenerJob) -> dict:
+    async def get_company_info(self, job: ScreenerJob, keys: Optional[List[str]] = None) -> dict:
         """
         Get company information using a web search.
         Searches for the following information:
@@ -24,8 +40,10 @@ class WebResearcher:
             - The team of the company, including founders.
         Searches only on the company website, so the pages that can be googled with site:website_url.
         Builds prompts for each of the above information and uses the LLM search engine to generate the answers.
+        At most SEARCH_CONCURRENCY searches run at once and each one is bounded by SEARCH_TIMEOUT.
         Args:
             job: the job object containing the company URL and other details.
+            keys: the information keys to search for (all by default), e.g. to retry the failed ones.
 
         Returns:
             dict: A dictionary containing the following information.
@@ -34,24 +52,44 @@ class WebResearcher:
             - products_services: The products and services offered by the company.
             - market: The market the company works on.
             - team: The team of the company.
+            A failed search is returned as {"content": "N/A", "error": "..."}.
         """
-        info_topics = {
-            "company_name": "What is the name of the company?",
-            "business_model": "What is the business model of the company? It can be B2B, B2C, C2C, etc.",
-            "products_services": "What products and/or services does the company offer?",
-            "market": "What market does the company work in?",
-            "team": "Who are the founders and team members of the company?"
-        }
-        # answer = await self.llm_searcher.search_on_website(info_topics["team"], job.domain)
-        async def fetch_info(key, topic):
-            try:
-                answer = await self.llm_searcher.search_on_website(topic, job.domain)
-            except Exception as e:
-                self.logger.error(f"Error searching for {key}: {e}")
-                answer = "N/A"
-            return key, answer
-
-        tasks = [fetch_info(key, topic) for key, topic in info_topics.items()]
-        results_list = await asyncio.gather(*tasks)
-        results = {key: answer.dict() for key, answer in results_list}
+        topics = {key: INFO_TOPICS[key] for key in keys} if keys else INFO_TOPICS
+        results_list = await asyncio.gather(
+            *[self._search_topic(key, topic, job.domain) for key, topic in topics.items()]
+        )
+
+        results = {}
+        for key, answer, error in results_list:
+            if error is not None:
+                results[key] = {"content": "N/A", "error": str(error)}
+            else:
+                results[key] = answer.model_dump(exclude_none=True)
         return results
+
+    async def _search_topic(
+        self,
+        key: str,
+        topic: str,
+        domain: str
+    ) -> Tuple[str, Optional[WebSearchResponse], Optional[Exception]]:
+        """
+        Search the company website for a single topic.
+
+        Args:
+            key: Key of the topic in the results
+            topic: Question to answer
+            domain: Company website domain
+
+        Returns:
+            Tuple of the key, the answer (None on failure) and the exception (None on success)
+        """
+        try:
+            async with self._semaphore:
+                answer = await asyncio.wait_for(
+                    self.llm_searcher.search_on_website(topic, domain), SEARCH_TIMEOUT
+                )
+            return key, answer, None
+        except Exception as e:
+            self.logger.error(f"Error searching for {key}: {e!r}")
+            return key, None, e
@@ -1,32 +1,53 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 
 
 log_dir = "logs"
 log_filename = os.path.join(log_dir, "tracing.log")
 
+# Records of all job loggers go through this queue to a single file handler running in the listener thread,
+# so logging calls never block the event loop on disk I/O
+_log_queue = queue.Queue(-1)
+_listener = None
+_listener_lock = threading.Lock()
 
-def setup_logger(job_id: str) -> logging.Logger:
 
-    # Create the logs directory if it doesn't exist
-    os.makedirs(log_dir, exist_ok=True)
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
 
-    # Create a logger instance
-    logger = logging.getLogger(job_id)
-    logger.setLevel(logging.INFO)
+        # Create the logs directory if it doesn't exist
+        os.makedirs(log_dir, exist_ok=True)
 
-    if not logger.handlers:
         # Create a file handler to write logs to a file
         file_handler = logging.FileHandler(log_filename, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
 
-        # file_handler.stream = open(file_handler.stream.fileno(), mode='w', encoding='utf-8', closefd=False)
-
         # Create a formatter and set it for the file handler
         # formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(message)s', datefmt='%m-%d %H:%M:%S')
         file_handler.setFormatter(formatter)
 
-        # Add the file handler to the logger
-        logger.addHandler(file_handler)
+        _listener = logging.handlers.QueueListener(_log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def setup_logger(job_id: str) -> logging.Logger:
+
+    _start_listener()
+
+    # Create a logger instance
+    logger = logging.getLogger(job_id)
+    logger.setLevel(logging.INFO)
+
+    if not logger.handlers:
+        # Hand records over to the shared listener
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
     return logger
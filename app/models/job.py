@@ -2,9 +2,13 @@
 Job model for tracking report generation status.
 """
 from enum import Enum
-from typing import Dict, Optional
-from pydantic import BaseModel
+from typing import Optional, Protocol
 
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict
+from redis.asyncio import Redis
+
+from app.constants import settings
 from app.models.report import ReportModel
 
 
@@ -16,15 +20,111 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+class JobPriority(str, Enum):
+    """Priority of a report generation job."""
+    INTERACTIVE = "interactive"
+    BATCH = "batch"  # LLM sections go through the cheaper, slower OpenAI Batch API
+
+
 class ScreenerJob(BaseModel):
     """Model for tracking report generation jobs."""
+    # Not frozen: the report generator updates the status, report and error of a job and stores it again
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
+
     id: str
     status: JobStatus
     url: str
+    priority: JobPriority = JobPriority.INTERACTIVE
     domain: str | None = None
     report: ReportModel | None = None
     error: str | None = None
 
 
-# In-memory database for jobs (replace with a proper database in production)
-jobs_db: Dict[str, ScreenerJob] = {}
+# Jobs older than this are dropped from the store, together with their reports
+JOB_TTL = 86_400
+MAX_JOBS = 10_000
+
+REDIS_KEY_PREFIX = "job:"
+
+
+class JobStore(Protocol):
+    """Storage of the jobs, shared by the API handlers and the report generators."""
+
+    async def get(self, job_id: str) -> Optional[ScreenerJob]: ...
+
+    async def put(self, job: ScreenerJob) -> None: ...
+
+    async def delete(self, job_id: str) -> None: ...
+
+
+class MemoryJobStore:
+    """
+    In-memory job store of a single process.
+    Bounded by size and age so that a long-running process does not keep every report forever.
+    """
+
+    def __init__(self):
+        self.jobs: TTLCache = TTLCache(maxsize=MAX_JOBS, ttl=JOB_TTL)
+
+    async def get(self, job_id: str) -> Optional[ScreenerJob]:
+        return self.jobs.get(job_id)
+
+    async def put(self, job: ScreenerJob) -> None:
+        self.jobs[job.id] = job
+
+    async def delete(self, job_id: str) -> None:
+        self.jobs.pop(job_id, None)
+
+
+class RedisJobStore:
+    """Job store in Redis, shared by all worker processes so that any of them can serve a job's status and report."""
+
+    def __init__(self, redis_url: str):
+        self.redis = Redis.from_url(redis_url)
+
+    async def get(self, job_id: str) -> Optional[ScreenerJob]:
+        data = await self.redis.get(REDIS_KEY_PREFIX + job_id)
+        return ScreenerJob.model_validate_json(data) if data is not None else None
+
+    async def put(self, job: ScreenerJob) -> None:
+        await self.redis.set(REDIS_KEY_PREFIX + job.id, job.model_dump_json(), ex=JOB_TTL)
+
+    async def delete(self, job_id: str) -> None:
+        await self.redis.delete(REDIS_KEY_PREFIX + job_id)
+
+
+job_store: JobStore = RedisJobStore(settings.redis_url) if settings.redis_url else MemoryJobStore()
+
+
+async def get_job(job_id: str) -> Optional[ScreenerJob]:
+    """
+    Get a job by ID.
+    Changes to the returned job are only kept once it is stored again with put_job.
+
+    Args:
+        job_id: ID of the job
+
+    Returns:
+        The job, or None if it does not exist or has expired
+    """
+    return await job_store.get(job_id)
+
+
+async def put_job(job: ScreenerJob) -> None:
+    """
+    Store a job, restarting its time to live.
+
+    Args:
+        job: Job to store
+    """
+    await job_store.put(job)
+
+
+async def delete_job(job_id: str) -> None:
+    """
+    Delete a job if it exists.
+
+    Args:
+        job_id: ID of the job
+    """
+    await job_store.delete(job_id)
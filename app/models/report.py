@@ -1,11 +1,13 @@
 """
 Report model for structured company information.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ReportModel(BaseModel):
     """Model for the structured company report."""
+    model_config = ConfigDict(frozen=True, extra="ignore", from_attributes=True)
+
     company_overview: str | None = None
     product_business_model: str | None = None
     market_analysis: str | None = None
@@ -13,3 +15,9 @@ class ReportModel(BaseModel):
     financial_metrics: str | None = None
     fundraising_history: str | None = None
     team_key_stakeholders: str | None = None
+
+
+class ContextSectionsModel(BaseModel):
+    """Report sections written from the collected company data alone, requested together in one structured call."""
+    company_overview: str
+    product_business_model: str
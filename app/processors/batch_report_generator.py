@@ -0,0 +1,170 @@
+"""
+Report generator for bulk jobs, sending the sections of all reports through one OpenAI batch.
+"""
+import asyncio
+import logging
+from typing import Dict, Any, List
+
+from app.constants import INSUFFICIENT_DATA_SECTION
+from app.core.openai_api import build_chat_request
+from app.models.job import get_job
+from app.models.report import ContextSectionsModel, ReportModel
+from app.processors.batch_submitter import submit_sections_batch, wait_for_sections_batch
+from app.processors.report_context import ReportContext
+from app.processors.report_polisher import polish_report
+from app.processors.report_generator import ReportGenerator
+
+
+class BatchReportGenerator:
+    """
+    Generates the reports of several jobs at half the LLM cost.
+    The data of all companies is collected first, then the single-call sections of all reports
+    are submitted as one batch. A batch may take minutes to hours, so this is meant for bulk
+    requests only; interactive jobs use ReportGenerator directly.
+    """
+
+    def __init__(self, job_ids: List[str]):
+        """
+        Initialize the batch report generator.
+
+        Args:
+            job_ids: IDs of the jobs to generate reports for
+        """
+        self.generators = {job_id: ReportGenerator(job_id) for job_id in job_ids}
+
+    async def generate_reports_async(self, urls: Dict[str, str]) -> None:
+        """
+        Generate the reports of all jobs.
+
+        Args:
+            urls: Company URL to analyze keyed by job ID
+        """
+        # Jobs with collected data whose report is not completed or failed yet
+        pending = set()
+        try:
+            raw_data = await self._collect_raw_data(urls)
+            if not raw_data:
+                return
+            pending.update(raw_data)
+            contexts = {job_id: self.generators[job_id].report_context(data) for job_id, data in raw_data.items()}
+
+            # Reports without data for the context sections are not sent to the model
+            with_data = {job_id for job_id, ctx in contexts.items() if self.generators[job_id].has_context_data(ctx.raw)}
+            section_prompts = []
+            for job_id in with_data:
+                for section, kwargs in self.generators[job_id].batch_section_requests(contexts[job_id]).items():
+                    section_prompts.append({"job_id": job_id, "section": section, "body": build_chat_request(**kwargs)})
+
+            # The market sections chain several dependent calls, so they run directly while the batch is processed
+            market_task = asyncio.gather(
+                *[self.generators[job_id].generate_section("market_analysis", ctx) for job_id, ctx in contexts.items()],
+                return_exceptions=True
+            )
+            results = {}
+            if section_prompts:
+                try:
+                    batch_id = await submit_sections_batch(section_prompts)
+                    logging.info(f"Submitted batch {batch_id} with {len(section_prompts)} sections of {len(with_data)} reports")
+                    results = await wait_for_sections_batch(batch_id)
+                except Exception as e:
+                    logging.error(f"Batch report generation failed, generating the sections directly: {e}")
+                    results = None
+            market_sections = dict(zip(raw_data, await market_task))
+
+            for job_id, ctx in contexts.items():
+                generator = self.generators[job_id]
+                # A failure of one report (e.g. polishing or storing it) fails its job and not the others
+                try:
+                    if job_id not in with_data:
+                        sections = dict.fromkeys(ContextSectionsModel.model_fields, INSUFFICIENT_DATA_SECTION)
+                    elif results is None:
+                        sections = await self._generate_directly(generator, ctx)
+                    else:
+                        models = {
+                            prompt["section"]: prompt["body"]["model"]
+                            for prompt in section_prompts if prompt["job_id"] == job_id
+                        }
+                        sections = {
+                            section: generator.llm.record_batch_response(models[section], body)
+                            for section, body in results.get(job_id, {}).items()
+                        }
+                    market_analysis = market_sections[job_id]
+                    if isinstance(market_analysis, Exception):
+                        generator.logger.error(f"Error generating section market_analysis: {market_analysis!r}")
+                    else:
+                        sections["market_analysis"] = market_analysis
+                    await generator.complete_job(await polish_report(generator.llm, ReportModel(**sections)))
+                except Exception as e:
+                    await self._fail_job(generator, e)
+                pending.discard(job_id)
+        except Exception as e:
+            # A failure shared by all reports, e.g. while building the batch requests
+            for job_id in pending:
+                await self._fail_job(self.generators[job_id], e)
+        finally:
+            await asyncio.gather(*[generator.close() for generator in self.generators.values()])
+
+    @staticmethod
+    async def _fail_job(generator: ReportGenerator, error: Exception) -> None:
+        """
+        Mark a job as failed, logging instead of raising if the job cannot be updated.
+
+        Args:
+            generator: Report generator of the job
+            error: Exception that made the report generation fail
+        """
+        try:
+            await generator.fail_job(error)
+        except Exception as e:
+            generator.logger.error(f"Could not mark job {generator.job_id} as failed: {e!r}")
+
+    async def _collect_raw_data(self, urls: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect the data of all companies concurrently; jobs whose data collection fails are marked as failed.
+
+        Args:
+            urls: Company URL to analyze keyed by job ID
+
+        Returns:
+            Combined raw data keyed by job ID
+        """
+        jobs = {job_id: await get_job(job_id) for job_id in self.generators}
+        job_ids = [job_id for job_id, job in jobs.items() if job is not None]
+        results = await asyncio.gather(
+            *[self.generators[job_id].collect_raw_data(jobs[job_id], urls[job_id]) for job_id in job_ids],
+            return_exceptions=True
+        )
+
+        raw_data = {}
+        for job_id, result in zip(job_ids, results):
+            if isinstance(result, Exception):
+                await self._fail_job(self.generators[job_id], result)
+            else:
+                raw_data[job_id] = result
+        return raw_data
+
+    @staticmethod
+    async def _generate_directly(generator: ReportGenerator, ctx: ReportContext) -> Dict[str, str]:
+        """
+        Generate the batchable sections of a report with direct calls, when the batch could not be run.
+
+        Args:
+            generator: Report generator of the job
+            ctx: Report context of the job
+
+        Returns:
+            Generated sections keyed by report field; failed sections are omitted
+        """
+        fields = list(generator.batch_section_requests(ctx))
+        results = await asyncio.gather(
+            *[generator.generate_section(field, ctx) for field in fields],
+            return_exceptions=True
+        )
+
+        sections = {}
+        for field, result in zip(fields, results):
+            if isinstance(result, Exception):
+                generator.logger.error(f"Error generating section {field}: {result!r}")
+            else:
+                sections[field] = result
+        return sections
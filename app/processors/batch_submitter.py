@@ -0,0 +1,46 @@
+"""
+Submission of the report sections of several jobs as a single OpenAI batch.
+"""
+from collections import defaultdict
+from typing import Dict, Any, List
+
+from app.core.openai_batch import submit_batch, wait_for_batch
+
+# Separates the job ID from the section name in the custom ID of a batch request
+CUSTOM_ID_SEPARATOR = ":"
+
+
+async def submit_sections_batch(section_prompts: List[Dict[str, Any]]) -> str:
+    """
+    Submit the section requests of several jobs as one batch.
+
+    Args:
+        section_prompts: Items with the "job_id", the "section" (report field) and the chat completion
+            request "body" of a section
+
+    Returns:
+        ID of the created batch
+    """
+    return await submit_batch({
+        f"{prompt['job_id']}{CUSTOM_ID_SEPARATOR}{prompt['section']}": prompt["body"]
+        for prompt in section_prompts
+    })
+
+
+async def wait_for_sections_batch(batch_id: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Wait for a batch submitted by submit_sections_batch to complete.
+
+    Args:
+        batch_id: ID of the batch
+
+    Returns:
+        Chat completion response bodies keyed by job ID and section; failed requests are omitted
+    """
+    results = await wait_for_batch(batch_id)
+
+    sections = defaultdict(dict)
+    for custom_id, body in results.items():
+        job_id, section = custom_id.rsplit(CUSTOM_ID_SEPARATOR, 1)
+        sections[job_id][section] = body
+    return dict(sections)
@@ -1,10 +1,15 @@
+import asyncio
 import os
 from typing import Dict, Any
-import json
 
+from app.constants import INSUFFICIENT_DATA_SECTION, settings
 from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.core.source_cache import MARKET_SEARCH_TTL, get_cached_async, set_cached_async
+from app.processors.report_context import ReportContext
+from app.utils.data_utils import canonical_json, dig, has_content
 from app.data_sources.openai_websearch import OpenaiWebSearch
 
+
 SYSTEM_PROMPT = """You are a market analyst creating a market report for a company."""
 
 SECTION_PROMPT = """
@@ -31,6 +36,48 @@ Company market description:
 Market description for search queries:
 """
 
+MARKET_SEARCH_PROMPT = """
+Given the following company market description:
+---
+{raw_market_description}
+---
+Identify the market the company operates in, without focusing on the company itself.
+Search the web for the following parameters of this market:
+{parameters}
+If exact figures are not available, provide reasonable estimates based on the industry and similar markets.
+Write a concise market overview report in Markdown, using bullet points if appropriate.
+If the search results contain numbers, use them.
+DO NOT invent information, base all content only on the search results.
+DO NOT include the company name in the report.
+DO NOT mention source links.
+"""
+
+# Templates split once on their placeholder, so that building a prompt is a plain concatenation
+# and the bytes ahead of the data are the same for every request
+_SECTION_PREFIX, _SECTION_SUFFIX = SECTION_PROMPT.split("{data}")
+_DESCRIPTION_PREFIX, _DESCRIPTION_SUFFIX = MARKET_DESCRIPTION_PROMPT.split("{raw_market_description}")
+
+# Market parameters searched on the web, with the query template for each of them
+MARKET_PARAMETERS = {
+    "Total Addressable Market (TAM)": "What is the total addressable market (TAM) for '{market}'? Provide recent figures or best estimates.",
+    "Market Segments": "What are the main market segments for '{market}'? List and briefly describe them.",
+    "CAGR": "What is the Compound Annual Growth Rate (CAGR) for '{market}'? Provide recent figures or best estimates.",
+    "Geographic Expansion": "What are the main geographic regions for '{market}'? Are there notable trends in geographic expansion?",
+}
+
+# The parameter list is fixed, so it is filled into the web search prompt once
+_MARKET_SEARCH_PREFIX, _MARKET_SEARCH_SUFFIX = MARKET_SEARCH_PROMPT.replace(
+    "{parameters}", "\n".join(f"- {parameter}" for parameter in MARKET_PARAMETERS)
+).split("{raw_market_description}")
+
+
+def _normalize(market_description: str) -> str:
+    """
+    Normalize a market description for use in a cache key: lowercase, with the whitespace collapsed.
+    The words and their order are kept, as they change the meaning (e.g. "for banks, not insurers").
+    """
+    return " ".join(market_description.lower().split())
+
 
 class MarketProcessor:
     """Class for processing data using LLMs """
@@ -56,9 +103,12 @@ class MarketProcessor:
         Returns:
             Generated text response
         """
+        # The prompt carries the market data itself, so only the same prompt may be served from the cache
         response = await self.llm.get_response(
             system_prompt=SYSTEM_PROMPT,
             prompt=prompt,
+            model=settings.section_model,
+            cache_scope=prompt,
         )
         return response
 
@@ -73,9 +123,28 @@ class MarketProcessor:
             Dictionary with the search results
         """
         answer = await self.searcher.search_on_web(topic)
-        return answer.dict() if answer else {"content": "N/A"}
+        return answer.model_dump(exclude_none=True) if answer else {"content": "N/A"}
 
-    async def generate(self, data: Dict[str, Any]) -> str:
+    async def search_parameter(self, parameter: str, market_description: str) -> Dict[str, Any]:
+        """
+        Search for a market parameter, reusing the result of a previous search for the same market.
+
+        Args:
+            parameter: Name of the parameter, a key of MARKET_PARAMETERS
+            market_description: Generic market description
+
+        Returns:
+            Dictionary with the search results
+        """
+        key = f"market_search:{parameter}|{_normalize(market_description)}"
+        result = await get_cached_async(key)
+        if result is None:
+            result = await self.search(MARKET_PARAMETERS[parameter].format(market=market_description))
+            if result.get("content", "N/A") != "N/A":
+                await set_cached_async(key, result, MARKET_SEARCH_TTL)
+        return result
+
+    async def generate(self, ctx: ReportContext) -> str:
         """
         Generate the market research section.
         Collects data from web using the OpenAI web searcher and formats it into a Markdown report.
@@ -87,46 +156,77 @@ class MarketProcessor:
          - geographic expansion.
         When building search queries, we use the company name and the market description.
         The market description can be something like "Company operates in the cryptocurrency exchange market, offering services such as spot trading, futures, margin trading, and staking for various cryptocurrencies."
-        Makes separate searches for each of the parameters. and then aggregates them into a single report.
+        By default a single request with the web search tool searches all the parameters and writes the report.
+        With the market_web_search_tool setting disabled, separate searches are made for each of the parameters
+        and then aggregated into a single report.
         If exact figures are not available, we provide reasonable estimates based on the industry and similar companies.
 
         Formats the report in Markdown.
 
         Args:
-            data: Raw data collected from various sources
+            ctx: Report data; its canonical JSON is not used, the market section is built from its own searches
+
+        Returns:
+            Markdown formatted market research
+        """
+        data = ctx.raw
+        raw_market_description = dig(data, "website_data", "market", "content") or ""
+        if not has_content([raw_market_description]):
+            return INSUFFICIENT_DATA_SECTION
+        if settings.market_web_search_tool:
+            return await self._generate_with_web_search(raw_market_description)
+        return await self._generate_with_searches(data.get("company_name", ""), raw_market_description)
+
+    async def _generate_with_web_search(self, raw_market_description: str) -> str:
+        """
+        Generate the market research section with a single web search tool request,
+        reusing the report of a previous request for the same market description.
+
+        Args:
+            raw_market_description: Market description from the website data
 
         Returns:
             Markdown formatted market research
         """
-        company_name = data.get("company_name", "")
-        raw_market_description = data.get("website_data", {}).get("market", {}).get("content", "")
+        key = f"market_report:{settings.section_model}|{_normalize(raw_market_description)}"
+        report = await get_cached_async(key)
+        if report is None:
+            report = await self.llm.get_web_search_response(
+                system_prompt=SYSTEM_PROMPT,
+                prompt=_MARKET_SEARCH_PREFIX + raw_market_description + _MARKET_SEARCH_SUFFIX,
+                model=settings.section_model,
+            )
+            if report:
+                await set_cached_async(key, report, MARKET_SEARCH_TTL)
+        return report
+
+    async def _generate_with_searches(self, company_name: str, raw_market_description: str) -> str:
+        """
+        Generate the market research section with one web search per market parameter.
+
+        Args:
+            company_name: Name of the company
+            raw_market_description: Market description from the website data
 
+        Returns:
+            Markdown formatted market research
+        """
         # Use LLM to rewrite the market description for search queries
-        rewrite_prompt = MARKET_DESCRIPTION_PROMPT.replace("{raw_market_description}", raw_market_description)
+        rewrite_prompt = _DESCRIPTION_PREFIX + raw_market_description + _DESCRIPTION_SUFFIX
         market_description = await self._call_llm(rewrite_prompt)
 
-        parameters = [
-            ("Total Addressable Market (TAM)", f"What is the total addressable market (TAM) for '{market_description}'? Provide recent figures or best estimates."),
-            ("Market Segments", f"What are the main market segments for '{market_description}'? List and briefly describe them."),
-            ("CAGR", f"What is the Compound Annual Growth Rate (CAGR) for '{market_description}'? Provide recent figures or best estimates."),
-            ("Geographic Expansion", f"What are the main geographic regions for '{market_description}'? Are there notable trends in geographic expansion?")
-        ]
-
-        # Run searches for all parameters asynchronously
-        import asyncio
-        async def fetch_param(key, query):
-            search_result = await self.search(query)
-            return key, search_result.get("content", "N/A")
-        tasks = [fetch_param(key, query) for key, query in parameters]
-        results_list = await asyncio.gather(*tasks)
-        results = {k: v for k, v in results_list}
+        # All searches depend on the rewritten description, and run concurrently once it is known.
+        # They only share the wrapper's concurrency limit, which leaves room for all of them.
+        results = await asyncio.gather(
+            *[self.search_parameter(parameter, market_description) for parameter in MARKET_PARAMETERS]
+        )
 
         # Prepare structured data for LLM
         llm_data = {
             "company_name": company_name,
             "market_description": market_description,
-            "parameters": {k: results[k] for k, _ in parameters}
+            "parameters": {key: result.get("content", "N/A") for key, result in zip(MARKET_PARAMETERS, results)}
         }
-        llm_prompt = SECTION_PROMPT.format(data=json.dumps(llm_data, ensure_ascii=False, indent=2))
+        llm_prompt = _SECTION_PREFIX + canonical_json(llm_data) + _SECTION_SUFFIX
         report = await self._call_llm(llm_prompt)
         return report
@@ -1,21 +1,21 @@
 import os
 from typing import Dict, Any
-import json
 
+from app.constants import INSUFFICIENT_DATA_SECTION, REPORT_SYSTEM_PROMPT, settings
 from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.processors.report_context import ReportContext
+from app.utils.data_utils import dig, has_content
 
 
-SYSTEM_PROMPT = """You are a financial analyst creating a company overview section for a report.
-Write a concise but informative company overview in 4-6 lines.
-Include the company's business model, geography, stage, and uniqueness.
-Format your response in Markdown."""
-
-SECTION_PROMPT = """
-You are an expert business analyst. Given the following structured company information:
+# Website research topics the overview section is written from
+WEBSITE_TOPICS = ("business_model", "products_services", "market", "team")
 
-{data}
 
-Write a comprehensive company overview report in Markdown, covering these sections **only if the information is present in the data**:
+SECTION_PROMPT = """
+You are now creating a company overview section for the report, as a financial analyst.
+Write a concise but informative company overview in 4-6 lines.
+Include the company's business model, geography, stage, and uniqueness.
+Using the structured company information provided above, write a comprehensive company overview report in Markdown, covering these sections **only if the information is present in the data**:
 
 1. # [Company Name]
    - Include company name as the main header.
@@ -66,29 +66,65 @@ class OverviewProcessor:
         """
         self.llm = llm
 
-    async def _call_llm(self, prompt: str) -> str:
+    @staticmethod
+    def project(data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Call the OpenAI API with a prompt.
+        Keep only the parts of the raw data the section is written from.
+        Failed research topics and source links are dropped as well.
 
         Args:
-            prompt: User prompt to send to the API
-            system_prompt: Optional system prompt to provide context
+            data: Raw data collected from various sources
 
         Returns:
-            Generated text response
+            Projected data
+        """
+        website_data = dig(data, "website_data")
+        return {
+            "company_name": data.get("company_name"),
+            "url": data.get("url"),
+            "website_data": {
+                topic: website_data[topic]["content"]
+                for topic in WEBSITE_TOPICS
+                if topic in website_data and "error" not in website_data[topic]
+            },
+        }
+
+    @staticmethod
+    def has_data(data: Dict[str, Any]) -> bool:
         """
-        response = await self.llm.get_response(
-            system_prompt=SYSTEM_PROMPT,
-            prompt=prompt,
-        )
-        return response
+        Check whether the raw data holds anything the section can be written from.
+
+        Args:
+            data: Raw data collected from various sources
 
-    async def generate(self, data: Dict[str, Any]) -> str:
+        Returns:
+            True if at least one of the website research topics of the section was answered
+        """
+        return has_content(OverviewProcessor.project(data)["website_data"].values())
+
+    def request_args(self, ctx: ReportContext) -> Dict[str, Any]:
+        """
+        Build the LLM request for the section, used both for direct and batched calls.
+
+        Args:
+            ctx: Report data with its canonical JSON, shared with the other sections
+
+        Returns:
+            Keyword arguments for LLMAPIWrapper.get_response
+        """
+        return {
+            "system_prompt": REPORT_SYSTEM_PROMPT,
+            "prompt": SECTION_PROMPT,
+            "context": ctx.json_cached,
+            "model": settings.section_model,
+        }
+
+    async def generate(self, ctx: ReportContext) -> str:
         """
         Generate the company overview section.
 
         Args:
-            data: Raw data collected from various sources
+            ctx: Report data with its canonical JSON, shared with the other sections
 
         Returns:
             Markdown formatted company overview
@@ -106,7 +142,7 @@ class OverviewProcessor:
         # Search Data: {json.dumps(data.get("search_data", {}).get("company overview", {}), indent=2)}
         # """
 
-        prompt = SECTION_PROMPT.replace(
-            "{data}", json.dumps(data)
-        )
-        return await self._call_llm(prompt)
\ No newline at end of file
+        if not self.has_data(ctx.raw):
+            return INSUFFICIENT_DATA_SECTION
+
+        return await self.llm.get_response(**self.request_args(ctx), stream=True)
\ No newline at end of file
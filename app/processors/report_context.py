@@ -0,0 +1,22 @@
+"""
+Report data shared by the section processors.
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict
+
+
+@dataclass
+class ReportContext:
+    """
+    Raw data of one report together with its canonical JSON.
+    The JSON is serialized on first use and then shared by all sections, so the same bytes are
+    not computed once per section and the prompt prefixes of the sections stay identical.
+    """
+    raw: Dict[str, Any]
+    serialize: Callable[[Dict[str, Any]], str] = field(repr=False)
+
+    @cached_property
+    def json_cached(self) -> str:
+        """Canonical JSON of the data the sections are written from."""
+        return self.serialize(self.raw)
@@ -5,19 +5,34 @@ from typing import Dict, Any, List
 import asyncio
 
 from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.core.report_cache import cache_report, cache_section, get_cached_report, get_cached_sections, report_cache_key
 from app.data_sources.search_sources import SerperDataSource, PerplexityDataSource
 from app.data_sources.scraper_sources import ScraperAPIDataSource
 from app.data_sources.linkedin_source import CoreSignalDataSource
 from app.data_sources.funding_source import TracxnDataSource
 from app.data_sources.web_searcher import WebResearcher
 from app.logger import setup_logger
-from app.models.job import JobStatus, jobs_db
-from app.models.report import ReportModel
+from app.models.job import JobPriority, JobStatus, ScreenerJob, get_job, put_job
+from app.constants import INSUFFICIENT_DATA_SECTION, REPORT_SYSTEM_PROMPT, SECTION_TIMEOUT, settings
+from app.models.report import ContextSectionsModel, ReportModel
 from app.processors.market_processor import MarketProcessor
-from app.processors.overview_processor import OverviewProcessor
-from app.processors.product_processor import ProductProcessor
+from app.processors.overview_processor import OverviewProcessor, SECTION_PROMPT as OVERVIEW_SECTION_PROMPT
+from app.processors.product_processor import ProductProcessor, SECTION_PROMPT as PRODUCT_SECTION_PROMPT
+from app.processors.report_context import ReportContext
+from app.processors.report_polisher import polish_report
 from app.utils.url_parser import extract_company_name_from_url, extract_domain_from_url
 from app.processors.llm_processor import LLMProcessor
+from app.utils.data_utils import canonical_json
+
+
+# Instructions of the sections in ContextSectionsModel, keyed by the response field they are written to
+CONTEXT_SECTIONS_PROMPT = f"""Write the following sections of the company report.
+Put the Markdown content of each section into the response field named in its header.
+
+## company_overview
+{OVERVIEW_SECTION_PROMPT}
+## product_business_model
+{PRODUCT_SECTION_PROMPT}"""
 
 
 class ReportGenerator:
@@ -33,10 +48,18 @@ class ReportGenerator:
         self.scraper_source = ScraperAPIDataSource()
         self.linkedin_source = CoreSignalDataSource()
         self.tracxn_source = TracxnDataSource()
-        self.llm_processor = LLMProcessor()
+        self.llm_processor = LLMProcessor(llm=self.llm)
         self.overview_processor = OverviewProcessor(llm=self.llm)
         self.product_processor = ProductProcessor(llm=self.llm)
         self.market_processor = MarketProcessor(llm=self.llm)
+        # Section generators by report field, all called with the ReportContext and run concurrently.
+        # The competitive landscape, financial metrics, fundraising and team sections of the LLM processor
+        # are not registered while the search, research, LinkedIn and funding sources are disabled.
+        self.section_processors = {
+            "company_overview": self.overview_processor.generate,
+            "product_business_model": self.product_processor.generate,
+            "market_analysis": self.market_processor.generate,
+        }
 
     async def generate_report_async(self, url: str) -> None:
         """
@@ -47,64 +70,127 @@ class ReportGenerator:
             url: Company URL to analyze
         """
         try:
-            # Update job status to processing
-            job = jobs_db[self.job_id]
-            job.status = JobStatus.PROCESSING
-            job.domain = extract_domain_from_url(url)
-
-            # Extract company name from URL
-            company_name = extract_company_name_from_url(url)
-            self.logger.info(f"Generating report for {company_name} ({url}), job_id: {self.job_id}")
-
-            website_data = await self.web_search.get_company_info(job)
-
-            # serper_data = await self.serper_source.fetch_data(company_name, url)
-            # Collect data from all sources concurrently
-            # tasks = [
-            #     self.serper_source.fetch_data(company_name, url),
-            #     self.perplexity_source.fetch_data(company_name, url),
-            #     self.scraper_source.fetch_data(company_name, url),
-            #     self.linkedin_source.fetch_data(company_name, url),
-            #     self.tracxn_source.fetch_data(company_name, url)
-            # ]
-            #
-            # results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Combine all data into a structured format
-            if website_data["company_name"] and len(website_data["company_name"]["content"]) > 3:
-                company_name = website_data["company_name"]["content"]
-
-            raw_data = {
-                "company_name": company_name,
-                "url": url,
-                "website_data": website_data,
-                # "search_data": self._safe_extract(results, 0),
-                # "research_data": self._safe_extract(results, 1),
-                # "website_data": self._safe_extract(results, 2),
-                # "linkedin_data": self._safe_extract(results, 3),
-                # "funding_data": self._safe_extract(results, 4)
-            }
+            job = await get_job(self.job_id)
+            if job is None:
+                self.logger.error(f"Job {self.job_id} not found")
+                return
 
-            # Generate each report section using the LLM processor
-            report = await self._generate_report_sections(raw_data)
+            raw_data = await self.collect_raw_data(job, url)
 
-            # Update job with completed report
-            job.report = report
-            job.status = JobStatus.COMPLETED
-            jobs_db[self.job_id] = job
+            # Generate each report section using the LLM processor
+            report = await self._generate_report_sections(raw_data, job.priority)
 
-            self.logger.info(f"Report generation completed for job {self.job_id}")
+            await self.complete_job(report)
 
             return report
 
         except Exception as e:
-            self.logger.error(f"Error generating report for job {self.job_id}: {str(e)}")
-            # Update job status to failed
-            if self.job_id in jobs_db:
-                job = jobs_db[self.job_id]
-                job.status = JobStatus.FAILED
-                job.error = str(e)
-                jobs_db[self.job_id] = job
+            await self.fail_job(e)
+        finally:
+            await self.close()
+
+    async def collect_raw_data(self, job: ScreenerJob, url: str) -> Dict[str, Any]:
+        """
+        Mark the job as processing and collect the company data the report is generated from.
+
+        Args:
+            job: Job of the report
+            url: Company URL to analyze
+
+        Returns:
+            Combined raw data from all sources
+        """
+        # Update job status to processing
+        job.status = JobStatus.PROCESSING
+        job.domain = extract_domain_from_url(url)
+        await put_job(job)
+
+        # Extract company name from URL
+        company_name = extract_company_name_from_url(url)
+        self.logger.info(f"Generating report for {company_name} ({url}), job_id: {self.job_id}")
+
+        website_data = await self.web_search.get_company_info(job)
+        failed = [key for key, answer in website_data.items() if "error" in answer]
+        if failed:
+            # Retry only the searches that failed
+            self.logger.warning(f"Retrying failed web searches: {', '.join(failed)}")
+            website_data.update(await self.web_search.get_company_info(job, failed))
+
+        # serper_data = await self.serper_source.fetch_data(company_name, url)
+        # Collect data from all sources concurrently
+        # tasks = [
+        #     self.serper_source.fetch_data(company_name, url),
+        #     self.perplexity_source.fetch_data(company_name, url),
+        #     self.scraper_source.fetch_data(company_name, url),
+        #     self.linkedin_source.fetch_data(company_name, url),
+        #     self.tracxn_source.fetch_data(company_name, url)
+        # ]
+        #
+        # results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Combine all data into a structured format
+        if website_data["company_name"] and len(website_data["company_name"]["content"]) > 3:
+            company_name = website_data["company_name"]["content"]
+
+        return {
+            "company_name": company_name,
+            "url": url,
+            "website_data": website_data,
+            # "search_data": self._safe_extract(results, 0),
+            # "research_data": self._safe_extract(results, 1),
+            # "website_data": self._safe_extract(results, 2),
+            # "linkedin_data": self._safe_extract(results, 3),
+            # "funding_data": self._safe_extract(results, 4)
+        }
+
+    async def complete_job(self, report: ReportModel) -> None:
+        """
+        Store the generated report and mark the job as completed.
+
+        Args:
+            report: Generated report
+        """
+        job = await get_job(self.job_id)
+        if job is None:
+            self.logger.error(f"Job {self.job_id} expired before its report was completed")
+            return
+        job.report = report
+        job.status = JobStatus.COMPLETED
+        await put_job(job)
+
+        self.logger.info(
+            f"Report generation completed for job {self.job_id}, "
+            f"prompt cache hit rate {self.llm.cache_hit_rate:.0%}"
+        )
+
+    async def fail_job(self, error: Exception) -> None:
+        """
+        Mark the job as failed.
+
+        Args:
+            error: Exception that made the report generation fail
+        """
+        self.logger.error(f"Error generating report for job {self.job_id}: {str(error)}")
+        job = await get_job(self.job_id)
+        if job is not None:
+            job.status = JobStatus.FAILED
+            job.error = str(error)
+            await put_job(job)
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the data sources and the LLM processor
+        (the HTTP client shared by the data sources stays open).
+        """
+        await asyncio.gather(
+            self.serper_source.close(),
+            self.perplexity_source.close(),
+            self.scraper_source.close(),
+            self.linkedin_source.close(),
+            self.tracxn_source.close(),
+            self.llm_processor.close(),
+            return_exceptions=True
+        )
 
     def _safe_extract(self, results: List[Any], index: int) -> Dict[str, Any]:
         """
@@ -126,43 +212,206 @@ class ReportGenerator:
 
         return result
 
-    async def _generate_report_sections(self, raw_data: Dict[str, Any]) -> ReportModel:
+    def _shared_context(self, raw_data: Dict[str, Any]) -> str:
+        """
+        Build the context shared by the sections: the union of the parts of the raw data they are written from.
+
+        Args:
+            raw_data: Combined raw data from all sources
+
+        Returns:
+            Canonical JSON of the projected data
+        """
+        data = self.overview_processor.project(raw_data)
+        data["website_data"].update(self.product_processor.project(raw_data)["website_data"])
+        return canonical_json(data)
+
+    def report_context(self, raw_data: Dict[str, Any]) -> ReportContext:
+        """
+        Wrap the raw data of a report for the section processors.
+
+        Args:
+            raw_data: Combined raw data from all sources
+
+        Returns:
+            Report context, serializing the shared context on first use
+        """
+        return ReportContext(raw_data, self._shared_context)
+
+    def has_context_data(self, raw_data: Dict[str, Any]) -> bool:
+        """
+        Check whether there is any data to write the sections of ContextSectionsModel from.
+
+        Args:
+            raw_data: Combined raw data from all sources
+
+        Returns:
+            False if the sections should be filled with INSUFFICIENT_DATA_SECTION instead of being generated
+        """
+        return self.overview_processor.has_data(raw_data) or self.product_processor.has_data(raw_data)
+
+    def batch_section_requests(self, ctx: ReportContext) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the requests of the sections that can go through the OpenAI Batch API.
+
+        Args:
+            ctx: Report context
+
+        Returns:
+            Keyword arguments of LLMAPIWrapper.get_response keyed by report field
+        """
+        return {
+            "company_overview": self.overview_processor.request_args(ctx),
+            "product_business_model": self.product_processor.request_args(ctx),
+        }
+
+    async def _generate_report_sections(
+        self,
+        raw_data: Dict[str, Any],
+        priority: JobPriority = JobPriority.INTERACTIVE
+    ) -> ReportModel:
         """
         Generate report sections using the LLM processor.
+        Reports are cached by their collected data, so a rerun with unchanged data makes no LLM calls,
+        and drafted sections are cached separately, so a rerun after a failed section only regenerates that section.
 
         Args:
             raw_data: Combined raw data from all sources
+            priority: Priority of the job
 
         Returns:
             Structured Report object with all sections
         """
-        # Generate each section concurrently
-        # tasks = [
-        #     self.llm_processor.generate_company_overview(raw_data),
-        #     self.llm_processor.generate_product_business_model(raw_data),
-        #     self.llm_processor.generate_market_analysis(raw_data),
-        #     self.llm_processor.generate_competitive_landscape(raw_data),
-        #     self.llm_processor.generate_financial_metrics(raw_data),
-        #     self.llm_processor.generate_fundraising_history(raw_data),
-        #     self.llm_processor.generate_team_stakeholders(raw_data)
-        # ]
+        key = report_cache_key(raw_data)
+        report = await get_cached_report(key)
+        if report is not None:
+            self.logger.info(f"Report for job {self.job_id} served from the report cache")
+            return report
 
-        tasks = [
-            self.overview_processor.generate(raw_data),
-            self.product_processor.generate(raw_data),
-            self.market_processor.generate(raw_data),
-        ]
-        results = await asyncio.gather(*tasks)
-
-        # Create the report object
-        report = ReportModel(
-            company_overview=results[0],
-            product_business_model=results[1],
-            market_analysis=results[2],
-            # competitive_landscape=results[3],
-            # financial_metrics=results[4],
-            # fundraising_history=results[5],
-            # team_key_stakeholders=results[6]
-        )
+        sections = await get_cached_sections(key, self.section_processors)
+        drafted = await self._draft_sections(raw_data, priority, sections)
+        await asyncio.gather(*[cache_section(key, field, content) for field, content in drafted.items()])
+        sections.update(drafted)
 
+        report = await polish_report(self.llm, ReportModel(**sections))
+        if all(field in sections for field in self.section_processors):
+            await cache_report(key, report)
         return report
+
+    async def _draft_sections(
+        self,
+        raw_data: Dict[str, Any],
+        priority: JobPriority,
+        cached: Dict[str, str]
+    ) -> Dict[str, str]:
+        """
+        Draft the report sections that are not cached yet.
+        For non-interactive jobs the single-call sections are sent through the OpenAI Batch API.
+
+        Args:
+            raw_data: Combined raw data from all sources
+            priority: Priority of the job
+            cached: Cached sections keyed by report field, which are not generated again
+
+        Returns:
+            Drafted sections keyed by report field; failed sections are omitted
+        """
+        # The sections outside ContextSectionsModel build their own prompts (e.g. market searches). They are
+        # dispatched first, so that their requests are in flight while the shared context is serialized.
+        ctx = self.report_context(raw_data)
+        fields = [
+            field for field in self.section_processors
+            if field not in ContextSectionsModel.model_fields and field not in cached
+        ]
+        tasks = [asyncio.ensure_future(self.generate_section(field, ctx)) for field in fields]
+        await asyncio.sleep(0)
+
+        sections = {}
+        context_fields = [field for field in ContextSectionsModel.model_fields if field not in cached]
+        if context_fields and not self.has_context_data(raw_data):
+            # Nothing to write the context sections from, so they are not sent to the model
+            sections.update(dict.fromkeys(context_fields, INSUFFICIENT_DATA_SECTION))
+            context_fields = []
+
+        if not context_fields:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        elif priority == JobPriority.BATCH:
+            # The other sections (the market one chains several dependent calls) keep the direct path
+            requests = self.batch_section_requests(ctx)
+            batched, *results = await asyncio.gather(
+                self.llm.get_batch_responses({field: requests[field] for field in context_fields}),
+                *tasks,
+                return_exceptions=True
+            )
+            if isinstance(batched, Exception):
+                # Fall back to direct calls, as the bulk path does, keeping the sections that are already done
+                self.logger.warning(f"Batch section generation failed, generating sections directly: {batched!r}")
+                fields += context_fields
+                results += await asyncio.gather(
+                    *[self.generate_section(field, ctx) for field in context_fields],
+                    return_exceptions=True
+                )
+            else:
+                sections.update(batched)
+
+        else:
+            # The sections written from the shared context alone are requested in one structured call,
+            # paying for a single prefill and round trip; the others run concurrently with it.
+            # Serialize the data once; sections sending it as a shared prefix hit OpenAI's prompt cache.
+            combined, *results = await asyncio.gather(
+                asyncio.wait_for(self._generate_context_sections(ctx.json_cached), SECTION_TIMEOUT),
+                *tasks,
+                return_exceptions=True
+            )
+
+            if isinstance(combined, ContextSectionsModel):
+                sections.update({field: getattr(combined, field) for field in context_fields})
+            else:
+                # Fall back to one call per section
+                self.logger.warning(f"Combined section generation failed, generating sections separately: {combined!r}")
+                fields += context_fields
+                results += await asyncio.gather(
+                    *[self.generate_section(field, ctx) for field in context_fields],
+                    return_exceptions=True
+                )
+
+        # A failed section leaves its field empty instead of failing the whole report
+        for field, result in zip(fields, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error generating section {field}: {result!r}")
+            else:
+                sections[field] = result
+        return sections
+
+    async def generate_section(self, field: str, ctx: ReportContext) -> str:
+        """
+        Generate one section with its section processor, giving up after SECTION_TIMEOUT.
+
+        Args:
+            field: Report field of the section
+            ctx: Report context
+
+        Returns:
+            Markdown content of the section
+        """
+        return await asyncio.wait_for(self.section_processors[field](ctx), SECTION_TIMEOUT)
+
+    async def _generate_context_sections(self, context: str) -> ContextSectionsModel | None:
+        """
+        Generate the sections of ContextSectionsModel with a single structured output call.
+
+        Args:
+            context: Shared context of the sections
+
+        Returns:
+            Generated sections, or None if the model refused to answer
+        """
+        return await self.llm.get_parsed_response(
+            prompt=CONTEXT_SECTIONS_PROMPT,
+            response_format=ContextSectionsModel,
+            system_prompt=REPORT_SYSTEM_PROMPT,
+            max_tokens=8192,
+            model=settings.section_model,
+            context=context
+        )
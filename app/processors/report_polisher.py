@@ -0,0 +1,57 @@
+"""
+Final pass over the drafted report sections with a stronger model.
+"""
+import logging
+
+from app.constants import settings
+from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.models.report import ReportModel
+
+POLISH_SYSTEM_PROMPT = """You are a senior editor of company research reports.
+The draft sections of a report are provided as JSON in the first user message.
+Keep the Markdown formatting of the sections."""
+
+POLISH_PROMPT = """Polish each draft section of the company report above and put it into the response field of the same name.
+Tighten the wording and make the tone consistent across the sections, remove repetitions between sections.
+Keep every fact and figure of the drafts and do not add new information.
+Leave the fields of sections missing from the drafts empty."""
+
+
+async def polish_report(llm: LLMAPIWrapper, report: ReportModel) -> ReportModel:
+    """
+    Polish the sections drafted with the section model in a single call to the polish model.
+    The drafts are returned unchanged if no polish model is configured or the call fails.
+
+    Args:
+        llm: LLMAPIWrapper instance for making API calls
+        report: Report with the draft sections
+
+    Returns:
+        Report with the polished sections
+    """
+    if not settings.polish_model:
+        return report
+
+    drafts = report.model_dump_json(exclude_none=True)
+    try:
+        polished = await llm.get_parsed_response(
+            prompt=POLISH_PROMPT,
+            response_format=ReportModel,
+            system_prompt=POLISH_SYSTEM_PROMPT,
+            max_tokens=16384,
+            model=settings.polish_model,
+            context=drafts
+        )
+    except Exception as e:
+        logging.warning(f"Polishing the report failed, keeping the drafts: {e}")
+        return report
+    if polished is None:
+        logging.warning("Polishing the report was refused, keeping the drafts")
+        return report
+
+    # Only drafted sections are replaced, a section the polish pass dropped keeps its draft
+    return report.model_copy(update={
+        field: content
+        for field, content in polished.model_dump(exclude_none=True).items()
+        if content and getattr(report, field) is not None
+    })
@@ -0,0 +1,153 @@
+"""
+Data-driven report sections: each section is a spec of its prompts and the report data it is written from.
+"""
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from string import Formatter
+from typing import Dict, Any, Tuple, Union
+import asyncio
+import orjson
+
+from app.aggregators.llm_aggregator import LLMAggregator
+from app.utils.data_utils import dig
+from app.utils.prompt_compress import compress_for_prompt
+
+# Report data with more text than this is serialized in a worker thread, so that building the prompts
+# does not block the event loop while the other sections are waiting for their responses
+OFFLOAD_THRESHOLD = 32_000
+
+# Separates the static instructions of a section template from the company data
+DATA_DELIMITER = "--- DATA ---"
+
+def _exceeds(data: Any, limit: int) -> bool:
+    """Check whether the strings in nested data are longer than limit in total, stopping as soon as they are."""
+    total = 0
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item)
+            if total > limit:
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
+
+def placeholder(path: Tuple[str, ...]) -> str:
+    """Name of the template placeholder of a data path, e.g. search_data_company_overview."""
+    return "_".join(path).replace(" ", "_")
+
+
+def serialize_fragment(raw_data: Dict[str, Any], path: Tuple[str, ...], fragments: Dict[tuple, str]) -> str:
+    """
+    Serialize a subtree of the report data, trimmed to its key fields.
+
+    Args:
+        raw_data: Combined raw data from all data sources
+        path: Keys leading to the subtree
+        fragments: Subtrees of this report serialized so far, keyed by path. Shared by the sections
+            of a report so that subtrees used by several sections (e.g. website_data.home) are dumped once
+
+    Returns:
+        Compact JSON of the subtree, without the indentation whitespace that would be billed as prompt tokens
+    """
+    if path not in fragments:
+        fragments[path] = orjson.dumps(compress_for_prompt(dig(raw_data, *path))).decode()
+    return fragments[path]
+
+
+@dataclass(frozen=True, slots=True)
+class SectionSpec:
+    """
+    A report section. The template starts with the static instructions and ends with the company data
+    after the DATA_DELIMITER, so everything up to the delimiter is the same for every company
+    and can be served from the provider's prompt cache. Besides {company_name} and {url}, it has
+    a placeholder per data path (see placeholder()).
+    """
+    name: str
+    system_prompt: str
+    data_paths: Tuple[Tuple[str, ...], ...]
+    template: str
+    # The template split once into its literal parts and the slots between them. A slot is either
+    # a top-level key of the report data or a data path, so building a prompt is a single join
+    _parts: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _slots: Tuple[Union[str, Tuple[str, ...]], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        paths = {placeholder(path): path for path in self.data_paths}
+        parts = []
+        slots = []
+        literal_run = ""
+        for literal, name, _, _ in Formatter().parse(self.template):
+            # Escaped braces ({{ and }}) are yielded as extra literal-only items, joined into the part before the next slot
+            literal_run += literal
+            if name is not None:
+                if name not in paths and name not in ("company_name", "url"):
+                    raise ValueError(f"Unknown placeholder {{{name}}} in the template of section {self.name}")
+                parts.append(literal_run)
+                slots.append(paths.get(name, name))
+                literal_run = ""
+        parts.append(literal_run)
+        object.__setattr__(self, "_parts", tuple(parts))
+        object.__setattr__(self, "_slots", tuple(slots))
+
+    def build_prompts(self, raw_data: Dict[str, Any], fragments: Dict[tuple, str] = None) -> Tuple[str, str]:
+        """
+        Build the prompts of the section.
+
+        Args:
+            raw_data: Combined raw data from all data sources
+            fragments: Serialized subtrees of the report shared with its other sections (see serialize_fragment)
+
+        Returns:
+            Tuple of the system prompt and the user prompt
+        """
+        if fragments is None:
+            fragments = {}
+        values = (
+            serialize_fragment(raw_data, slot, fragments) if isinstance(slot, tuple) else str(raw_data[slot])
+            for slot in self._slots
+        )
+        prompt = "".join(chain.from_iterable(zip_longest(self._parts, values, fillvalue="")))
+        return self.system_prompt, prompt
+
+    async def build_prompts_async(self, raw_data: Dict[str, Any], fragments: Dict[tuple, str] = None) -> Tuple[str, str]:
+        """
+        Build the prompts of the section, in a worker thread if the report data is large.
+
+        Args:
+            raw_data: Combined raw data from all data sources
+            fragments: Serialized subtrees of the report shared with its other sections (see serialize_fragment)
+
+        Returns:
+            Tuple of the system prompt and the user prompt
+        """
+        if _exceeds(raw_data, OFFLOAD_THRESHOLD):
+            return await asyncio.to_thread(self.build_prompts, raw_data, fragments)
+        return self.build_prompts(raw_data, fragments)
+
+
+async def render_section(
+    spec: SectionSpec,
+    raw_data: Dict[str, Any],
+    llm_aggregator: LLMAggregator,
+    fragments: Dict[tuple, str] = None
+) -> str:
+    """
+    Generate the content of a report section.
+
+    Args:
+        spec: Spec of the section
+        raw_data: Combined raw data from all data sources
+        llm_aggregator: LLM aggregator for text generation
+        fragments: Serialized subtrees of the report shared with its other sections (see serialize_fragment)
+
+    Returns:
+        Markdown formatted content of the section
+    """
+    system_prompt, prompt = await spec.build_prompts_async(raw_data, fragments)
+    return await llm_aggregator.generate_content(prompt, system_prompt)
@@ -0,0 +1,162 @@
+"""
+Prompts of the report sections and the registry of their specs.
+"""
+from app.report_sections.section_spec import SectionSpec
+
+COMPANY_OVERVIEW_SYSTEM_PROMPT = """You are a financial analyst creating a company overview section for a report.
+Write a concise but informative company overview in 4-6 lines.
+Include the company's business model, geography, stage, and uniqueness.
+Format your response in Markdown."""
+
+COMPANY_OVERVIEW_TEMPLATE = """Based on the data below, create a company overview section for the company.
+--- DATA ---
+Company Name: {company_name}
+
+Company URL: {url}
+
+Website Data: {website_data_home}
+
+About Page: {website_data_about}
+
+LinkedIn Data: {linkedin_data_company_profile}
+
+Search Data: {search_data_company_overview}
+"""
+
+PRODUCT_BUSINESS_MODEL_SYSTEM_PROMPT = """You are a business analyst creating a product and business model section for a company report.
+Provide detailed information about the company's products, services, revenue streams and key characteristics.
+Present the information in a tabular or text form depending on the company type (consumer goods, SaaS, e-commerce, etc.).
+Format your response in Markdown."""
+
+PRODUCT_BUSINESS_MODEL_TEMPLATE = """Based on the data below, create a detailed product and business model section for the company.
+--- DATA ---
+Company Name: {company_name}
+
+Company URL: {url}
+
+Website Data:
+- Home: {website_data_home}
+- Products: {website_data_products}
+- Services: {website_data_services}
+- Solutions: {website_data_solutions}
+
+LinkedIn Data: {linkedin_data_company_profile}
+
+Search Data: {search_data_products_services}
+
+Research Data: {research_data_business_model}
+"""
+
+MARKET_ANALYSIS_SYSTEM_PROMPT = """You are a market analyst creating a market analysis section for a company report.
+Identify the Total Addressable Market (TAM), market segments, CAGR (Compound Annual Growth Rate), and geographic expansion.
+If exact figures are not available, provide reasonable estimates based on the industry and similar companies.
+Format your response in Markdown."""
+
+MARKET_ANALYSIS_TEMPLATE = """Based on the data below, create a market analysis section for the company.
+--- DATA ---
+Company Name: {company_name}
+
+Company URL: {url}
+
+Research Data: {research_data_market_analysis}
+
+Search Data: {search_data_market_size}
+
+Company Details: {funding_data_company_details}
+"""
+
+COMPETITIVE_LANDSCAPE_SYSTEM_PROMPT = """You are a competitive intelligence analyst creating a competitive landscape section for a company report.
+Identify direct competitors and their metrics (valuation, revenue, customers, geographic presence).
+Include indirect competitors if relevant.
+Create a table of competitors and provide a brief description of market saturation.
+Format your response in Markdown."""
+
+COMPETITIVE_LANDSCAPE_TEMPLATE = """Based on the data below, create a competitive landscape section for the company.
+--- DATA ---
+Company Name: {company_name}
+
+Company URL: {url}
+
+Research Data: {research_data_competitive_landscape}
+
+Search Data: {search_data_competitors}
+
+Company Details: {funding_data_company_details}
+"""
+
+FINANCIAL_METRICS_SYSTEM_PROMPT = """You are a financial analyst creating a financial metrics section for a company report.
+Extract key metrics such as Revenue, EBITDA, GMV, MRR/ARR, and number of customers.
+If specific figures are not available, provide estimates based on available data or industry benchmarks.
+Format your response in Markdown with a table of metrics if possible."""
+
+FINANCIAL_METRICS_TEMPLATE = """Based on the data below, create a financial metrics section for the company.
+--- DATA ---
+Company Name: {company_name}
+
+Company URL: {url}
+
+Research Data: {research_data_financial_metrics}
+
+Search Data: {search_data_revenue_financial_metrics}
+
+Company Details: {funding_data_company_details}
+"""
+
+# All report sections, in report order
+SECTIONS = (
+    SectionSpec(
+        name="company_overview",
+        system_prompt=COMPANY_OVERVIEW_SYSTEM_PROMPT,
+        data_paths=(
+            ("website_data", "home"),
+            ("website_data", "about"),
+            ("linkedin_data", "company_profile"),
+            ("search_data", "company overview"),
+        ),
+        template=COMPANY_OVERVIEW_TEMPLATE,
+    ),
+    SectionSpec(
+        name="product_business_model",
+        system_prompt=PRODUCT_BUSINESS_MODEL_SYSTEM_PROMPT,
+        data_paths=(
+            ("website_data", "home"),
+            ("website_data", "products"),
+            ("website_data", "services"),
+            ("website_data", "solutions"),
+            ("linkedin_data", "company_profile"),
+            ("search_data", "products services"),
+            ("research_data", "business_model"),
+        ),
+        template=PRODUCT_BUSINESS_MODEL_TEMPLATE,
+    ),
+    SectionSpec(
+        name="market_analysis",
+        system_prompt=MARKET_ANALYSIS_SYSTEM_PROMPT,
+        data_paths=(
+            ("research_data", "market_analysis"),
+            ("search_data", "market size"),
+            ("funding_data", "company_details"),
+        ),
+        template=MARKET_ANALYSIS_TEMPLATE,
+    ),
+    SectionSpec(
+        name="competitive_landscape",
+        system_prompt=COMPETITIVE_LANDSCAPE_SYSTEM_PROMPT,
+        data_paths=(
+            ("research_data", "competitive_landscape"),
+            ("search_data", "competitors"),
+            ("funding_data", "company_details"),
+        ),
+        template=COMPETITIVE_LANDSCAPE_TEMPLATE,
+    ),
+    SectionSpec(
+        name="financial_metrics",
+        system_prompt=FINANCIAL_METRICS_SYSTEM_PROMPT,
+        data_paths=(
+            ("research_data", "financial_metrics"),
+            ("search_data", "revenue financial metrics"),
+            ("funding_data", "company_details"),
+        ),
+        template=FINANCIAL_METRICS_TEMPLATE,
+    ),
+)
@@ -1,9 +1,44 @@
 """
 Request models for the Company Screener API.
 """
-from pydantic import BaseModel, HttpUrl
+from functools import lru_cache
+from typing import Annotated, List
+
+from pydantic import AfterValidator, BaseModel, Field, HttpUrl, TypeAdapter
+
+from app.models.job import JobPriority
+
+# Validates and normalizes URLs exactly like an HttpUrl field (lowercase host, trailing slash, ...),
+# so that cache keys and the company name and domain extracted from the URL do not change
+_HTTP_URL = TypeAdapter(HttpUrl)
+
+
+@lru_cache(maxsize=4096)
+def validate_url(url: str) -> str:
+    """
+    Validate and normalize a URL like an HttpUrl field, once per distinct URL.
+    Repeated URLs, e.g. of companies requested again, skip building the URL object.
+
+    Args:
+        url: URL from the request
+
+    Returns:
+        The normalized URL
+    """
+    return str(_HTTP_URL.validate_python(url))
+
+
+CompanyUrl = Annotated[str, AfterValidator(validate_url)]
 
 
 class ReportRequest(BaseModel):
     """Request model for generating a company report."""
-    url: HttpUrl
+
+    url: CompanyUrl
+    priority: JobPriority = JobPriority.INTERACTIVE
+
+
+class BatchReportRequest(BaseModel):
+    """Request model for generating the reports of several companies through the OpenAI Batch API."""
+
+    urls: List[CompanyUrl] = Field(min_length=1)
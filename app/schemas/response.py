@@ -2,19 +2,23 @@
 Response models for the Company Screener API.
 """
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.models.job import JobStatus
 
 
 class JobResponse(BaseModel):
     """Response model for job status."""
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     status: JobStatus
 
 
 class ReportResponse(BaseModel):
     """Response model for the generated company report."""
+    model_config = ConfigDict(frozen=True)
+
     company_overview: str
     product_business_model: str
     market_analysis: str
@@ -1,43 +1,56 @@
 """
 Configuration utilities for handling environment variables and settings.
 """
-import os
-from dotenv import load_dotenv
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Optional
 
-# Load environment variables from .env file
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-class Config:
-    """Configuration class for the Company Screener."""
+# Keys checked by validate_required_keys
+REQUIRED_KEYS = (
+    "OPENAI_API_KEY",
+    "SERPER_API_KEY",
+    "PERPLEXITY_API_KEY",
+    "SCRAPER_API_KEY",
+    "CORESIGNAL_API_KEY",
+    "TRACXN_API_KEY",
+)
+
+
+class Config(BaseSettings):
+    """Configuration of the Company Screener, read from the environment and the .env file once and then frozen."""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
     # API Keys
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    SERPER_API_KEY = os.getenv("SERPER_API_KEY")
-    PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-    SCRAPER_API_KEY = os.getenv("SCRAPER_API_KEY")
-    CORESIGNAL_API_KEY = os.getenv("CORESIGNAL_API_KEY")
-    TRACXN_API_KEY = os.getenv("TRACXN_API_KEY")
+    OPENAI_API_KEY: Optional[str] = None
+    SERPER_API_KEY: Optional[str] = None
+    PERPLEXITY_API_KEY: Optional[str] = None
+    SCRAPER_API_KEY: Optional[str] = None
+    CORESIGNAL_API_KEY: Optional[str] = None
+    TRACXN_API_KEY: Optional[str] = None
 
     # API Settings
-    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+    OPENAI_MODEL: str = "gpt-4o"
 
     # Service Settings
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    DEBUG: bool = False
 
-    @classmethod
-    def validate_required_keys(cls) -> Dict[str, bool]:
+    def validate_required_keys(self) -> Dict[str, bool]:
         """
         Validate that all required API keys are present.
 
         Returns:
             Dictionary with API key names and their presence status
         """
-        return {
-            "OPENAI_API_KEY": bool(cls.OPENAI_API_KEY),
-            "SERPER_API_KEY": bool(cls.SERPER_API_KEY),
-            "PERPLEXITY_API_KEY": bool(cls.PERPLEXITY_API_KEY),
-            "SCRAPER_API_KEY": bool(cls.SCRAPER_API_KEY),
-            "CORESIGNAL_API_KEY": bool(cls.CORESIGNAL_API_KEY),
-            "TRACXN_API_KEY": bool(cls.TRACXN_API_KEY)
-        }
+        return {key: bool(getattr(self, key)) for key in REQUIRED_KEYS}
+
+
+@lru_cache
+def get_config() -> Config:
+    """
+    Get the configuration, read from the environment once per process.
+
+    Returns:
+        Shared Config instance
+    """
+    return Config()
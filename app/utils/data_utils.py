@@ -0,0 +1,55 @@
+"""
+Utilities for reading and serializing the nested raw data collected from the sources.
+"""
+from typing import Any, Iterable
+
+import orjson
+
+# Answer of a research topic that was not found
+NOT_AVAILABLE = "N/A"
+
+
+def dig(data: Any, *path: str) -> Any:
+    """
+    Walk a path of keys into nested dicts in a single pass.
+
+    Args:
+        data: Nested dicts, e.g. the raw data of a report
+        *path: Keys leading to the value (e.g. "website_data", "market", "content")
+
+    Returns:
+        The value at the path, or an empty dict if a key is missing or a non-dict is met on the way
+    """
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+        if data is None:
+            return {}
+    return data
+
+
+
+def has_content(contents: Iterable[Any]) -> bool:
+    """
+    Check whether any of the collected answers carries actual content.
+
+    Args:
+        contents: Answer contents, e.g. of the website research topics
+
+    Returns:
+        True if at least one answer is neither empty nor "N/A"
+    """
+    return any(content and content != NOT_AVAILABLE for content in contents)
+
+
+def canonical_json(obj: Any) -> str:
+    """
+    Serialize to indented JSON with sorted keys, so the same data always yields the same prompt.
+    All prompt builders use it, so the bytes of prompt prefixes shared between modules stay identical.
+
+    Args:
+        obj: Data to serialize
+
+    Returns:
+        Canonical JSON of the data
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
@@ -0,0 +1,48 @@
+"""
+Utilities for trimming collected data before it is put into LLM prompts.
+"""
+from typing import Any, FrozenSet
+
+# Fields marking a search result (e.g. a Serper organic or news hit). Only such dicts are reduced
+# to the key fields; profiles and company details keep their financial and headcount fields
+SEARCH_RESULT_MARKERS = frozenset({"snippet"})
+
+# Fields that carry the substance of a search result. Search results are reduced to these fields,
+# dropping sitelinks, positions, image and tracking fields
+DEFAULT_KEEP_KEYS = frozenset({
+    "title", "description", "headline", "headings", "about", "name",
+    "content", "snippet", "summary", "text",
+})
+
+# Marks a value that was cut to fit the prompt
+TRUNCATION_MARK = "…"
+
+
+def compress_for_prompt(
+    data: Any,
+    max_chars: int = 2000,
+    keep_keys: FrozenSet[str] = DEFAULT_KEEP_KEYS,
+    max_items: int = 20
+) -> Any:
+    """
+    Trim collected data for a prompt: search results are reduced to the key fields, strings are
+    capped at max_chars and lists at max_items. Other dicts keep all their fields and are walked recursively.
+
+    Args:
+        data: Data to trim, e.g. a subtree of the raw data of a report
+        max_chars: Maximum length of a string value
+        keep_keys: Key fields of search results
+        max_items: Maximum number of items of a list
+
+    Returns:
+        Trimmed copy of the data
+    """
+    if isinstance(data, str):
+        return data if len(data) <= max_chars else data[:max_chars] + TRUNCATION_MARK
+    if isinstance(data, dict):
+        if not SEARCH_RESULT_MARKERS.isdisjoint(data):
+            data = {key: value for key, value in data.items() if key in keep_keys}
+        return {key: compress_for_prompt(value, max_chars, keep_keys, max_items) for key, value in data.items()}
+    if isinstance(data, list):
+        return [compress_for_prompt(item, max_chars, keep_keys, max_items) for item in data[:max_items]]
+    return data
@@ -1,11 +1,31 @@
 """
 Utilities for parsing and extracting information from URLs.
 """
-from urllib.parse import urlparse
+from functools import lru_cache
+from urllib.parse import urlsplit
 import re
 from typing import Optional
 
+# Common platforms whose pages are not company websites
+NON_COMPANY_DOMAINS = frozenset({
+    'facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com',
+    'youtube.com', 'medium.com', 'github.com', 'wikipedia.org',
+    'google.com', 'amazon.com', 'apple.com', 'microsoft.com'
+})
 
+
+def _is_non_company_host(host: str) -> bool:
+    """
+    Check whether a host is one of the non-company platforms or a subdomain of one.
+    Each parent domain of the host is looked up in the set, so the cost depends on the number
+    of labels of the host and not on the number of platforms.
+    """
+    labels = host.split(".")
+    return any(".".join(labels[i:]) in NON_COMPANY_DOMAINS for i in range(len(labels) - 1))
+
+
+# URLs are parsed once: the same company and result URLs are looked up many times per report
+@lru_cache(maxsize=4096)
 def extract_company_name_from_url(url: str) -> str:
     """
     Extract the company name from a URL.
@@ -16,7 +36,7 @@ def extract_company_name_from_url(url: str) -> str:
     Returns:
         The extracted company name (e.g., "lightmatter")
     """
-    parsed_url = urlparse(url)
+    parsed_url = urlsplit(url)
     domain = parsed_url.netloc
 
     # Remove www. if present
@@ -33,6 +53,7 @@ def extract_company_name_from_url(url: str) -> str:
 
 
 
+@lru_cache(maxsize=4096)
 def extract_domain_from_url(url: str) -> str:
     """
     Extract the company name from a URL.
@@ -43,7 +64,7 @@ def extract_domain_from_url(url: str) -> str:
     Returns:
         The extracted company name (e.g., "lightmatter")
     """
-    parsed_url = urlparse(url)
+    parsed_url = urlsplit(url)
     domain = parsed_url.netloc
 
     # Remove www. if present
@@ -63,21 +84,11 @@ def is_company_website(url: str) -> bool:
     Returns:
         True if the URL is likely a company website, False otherwise
     """
-    parsed_url = urlparse(url)
+    parsed_url = urlsplit(url)
 
     # Check if the URL has a valid domain
     if not parsed_url.netloc:
         return False
 
     # Check if it's not a common non-company platform
-    non_company_domains = [
-        'facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com',
-        'youtube.com', 'medium.com', 'github.com', 'wikipedia.org',
-        'google.com', 'amazon.com', 'apple.com', 'microsoft.com'
-    ]
-
-    for domain in non_company_domains:
-        if domain in parsed_url.netloc:
-            return False
-
-    return True
+    return not _is_non_company_host(parsed_url.hostname or "")
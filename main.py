@@ -2,6 +2,8 @@
 Main FastAPI application entry point for the Company Screener service.
 """
 import uuid
+from typing import List
+
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 
 from dotenv import load_dotenv
@@ -9,10 +11,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.models.report import ReportModel
-from app.schemas.request import ReportRequest
+from app.schemas.request import BatchReportRequest, ReportRequest
 from app.schemas.response import JobResponse, ReportResponse
+from app.processors.batch_report_generator import BatchReportGenerator
 from app.processors.report_generator import ReportGenerator
-from app.models.job import ScreenerJob, JobStatus, jobs_db
+from app.models.job import ScreenerJob, JobPriority, JobStatus, get_job, put_job
+from app.data_sources.http_client import shutdown_http_client
 
 app = FastAPI(
     title="Company Screener API",
@@ -20,6 +24,13 @@ app = FastAPI(
     version="0.1.0",
 )
 
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the HTTP client shared by the data sources."""
+    await shutdown_http_client()
+
+
 @app.post("/generate", response_model=JobResponse)
 async def generate(request: ReportRequest, background_tasks: BackgroundTasks):
     """
@@ -29,8 +40,8 @@ async def generate(request: ReportRequest, background_tasks: BackgroundTasks):
     job_id = str(uuid.uuid4())
 
     # Create and store the job
-    job = ScreenerJob(id=job_id, status=JobStatus.PENDING, url=str(request.url))
-    jobs_db[job_id] = job
+    job = ScreenerJob(id=job_id, status=JobStatus.PENDING, url=str(request.url), priority=request.priority)
+    await put_job(job)
 
     # Start the report generation in the background
     report_gen = ReportGenerator(job_id=job_id)
@@ -42,15 +53,31 @@ async def generate(request: ReportRequest, background_tasks: BackgroundTasks):
     return JobResponse(job_id=job_id, status=JobStatus.PENDING)
 
 
+@app.post("/generate/batch", response_model=List[JobResponse])
+async def generate_batch(request: BatchReportRequest, background_tasks: BackgroundTasks):
+    """
+    Initiates the generation of several company reports through the OpenAI Batch API.
+    Cheaper than /generate, but the reports may take hours to complete.
+    Returns a job ID per URL, in the order of the request.
+    """
+    urls = {str(uuid.uuid4()): str(url) for url in request.urls}
+    for job_id, url in urls.items():
+        await put_job(ScreenerJob(id=job_id, status=JobStatus.PENDING, url=url, priority=JobPriority.BATCH))
+
+    report_gen = BatchReportGenerator(job_ids=list(urls))
+    background_tasks.add_task(report_gen.generate_reports_async, urls=urls)
+
+    return [JobResponse(job_id=job_id, status=JobStatus.PENDING) for job_id in urls]
+
+
 @app.get("/job/{job_id}", response_model=JobResponse)
 async def get_job_status(job_id: str):
     """
     Check the status of a report generation job.
     """
-    if job_id not in jobs_db:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-
-    job = jobs_db[job_id]
     return JobResponse(job_id=job_id, status=job.status)
 
 
@@ -59,11 +86,10 @@ async def get_report(job_id: str):
     """
     Retrieve the generated report if the job has completed.
     """
-    if job_id not in jobs_db:
+    job = await get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = jobs_db[job_id]
-
     if job.status != JobStatus.COMPLETED:
         raise HTTPException(
             status_code=400,
@@ -81,6 +107,7 @@ async def root():
         "version": "0.1.0",
         "endpoints": [
             "/generate",
+            "/generate/batch",
             "/job/{job_id}",
             "/report/{job_id}",
         ]
@@ -89,5 +116,6 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop is a faster event loop for the API and the report generation running in its background tasks
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop")
 
@@ -0,0 +1,56 @@
+"""
+Scoping of the semantic cache for web searches: the same topic on two company websites must never share an entry.
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.core import llm_api_wrapper
+from app.core.llm_api_wrapper import LLMAPIWrapper
+from app.core.llm_cache import SemanticCache
+from app.data_sources.openai_websearch import OpenaiWebSearch
+
+
+class AlwaysSimilarCache:
+    """Semantic cache treating all prompts of a scope as similar, the worst case for the embedding threshold."""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def lookup(self, prompt, system_prompt, model, context=None):
+        return self.entries.get(SemanticCache._scope(system_prompt, context, model)), None
+
+    async def store(self, prompt, system_prompt, model, content, embedding=None, context=None):
+        self.entries[SemanticCache._scope(system_prompt, context, model)] = content
+
+
+def _completion(content: str) -> SimpleNamespace:
+    message = SimpleNamespace(content=content, annotations=None)
+    usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, prompt_tokens_details=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def test_same_topic_on_different_websites_never_shares_an_entry(monkeypatch):
+    answers = {
+        "https://acme.com": '{"content": "Acme sells rockets", "link": "https://acme.com/products"}',
+        "https://acne.io": '{"content": "Acne sells skincare", "link": "https://acne.io/shop"}',
+    }
+
+    async def get_openai_response(prompt, system_prompt, max_tokens, model, context):
+        return _completion(next(answer for url, answer in answers.items() if url in prompt))
+
+    cache = AlwaysSimilarCache()
+    monkeypatch.setattr(llm_api_wrapper, "semantic_cache", cache)
+    monkeypatch.setattr(llm_api_wrapper, "get_openai_response", get_openai_response)
+    searcher = OpenaiWebSearch(llm=LLMAPIWrapper(), logger=None)
+
+    async def search_both():
+        return [await searcher.search_on_website("products", url) for url in answers]
+
+    acme, acne = asyncio.run(search_both())
+
+    assert acme.content == "Acme sells rockets"
+    assert acne.content == "Acne sells skincare"
+    assert len(cache.entries) == 2